@@ -0,0 +1,86 @@
+"""
+Compare disk usage, read time and decompression time of a season of events
+stored uncompressed, gzip- and zstd-compressed, read through `LocalLoader`.
+
+    python benchmarks/bench_compression.py [--matches 380]
+
+NOTE: reads are likely to be served from the page cache, so the read times are
+a lower bound on cold-cache reads from disk.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import statsbombapi
+import statsbombapi.storage
+import synthetic
+
+
+def _mirror(base_dir, season, compression):
+    for match_id, content in season.items():
+        file_path = os.path.join(base_dir, 'events', f'{match_id}.json')
+        statsbombapi.storage.write_atomic(
+            statsbombapi.storage.compressed_path(file_path, compression),
+            statsbombapi.storage.compress(content, compression)
+        )
+
+
+def _disk_usage(base_dir):
+    return sum(
+        os.path.getsize(os.path.join(directory, f))
+        for directory, _, filenames in os.walk(base_dir)
+        for f in filenames
+    )
+
+
+def _read_times(base_dir, season, compression):
+    read_time = decompress_time = 0.0
+    for match_id in season:
+        file_path = statsbombapi.storage.compressed_path(
+            os.path.join(base_dir, 'events', f'{match_id}.json'), compression
+        )
+        start = time.perf_counter()
+        with open(file_path, 'rb') as fp:
+            content = fp.read()
+        read_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        statsbombapi.storage.decompress(content)
+        decompress_time += time.perf_counter() - start
+
+    loader = statsbombapi.loaders.LocalLoader(base_dir, 'json')
+    start = time.perf_counter()
+    for match_id in season:
+        loader.load_events(match_id)
+    return read_time, decompress_time, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=synthetic.MATCHES_PER_SEASON)
+    args = parser.parse_args()
+
+    season = synthetic.season_events(n_matches=args.matches)
+    raw_size = sum(map(len, season.values()))
+    print(f'{args.matches} matches, {raw_size / 2**20:.1f} MiB of raw JSON\n')
+    print(f'{"codec":<8}{"disk MiB":>10}{"ratio":>8}{"write s":>10}{"read s":>9}{"decomp s":>10}{"load s":>9}')
+
+    codecs = [None, 'gzip']
+    if statsbombapi.storage.zstandard is not None:
+        codecs.append('zstd')
+    for compression in codecs:
+        with tempfile.TemporaryDirectory() as base_dir:
+            start = time.perf_counter()
+            _mirror(base_dir, season, compression)
+            write_time = time.perf_counter() - start
+            size = _disk_usage(base_dir)
+            read_time, decompress_time, load_time = _read_times(base_dir, season, compression)
+        print(
+            f'{str(compression):<8}{size / 2**20:>10.1f}{raw_size / size:>8.1f}'
+            f'{write_time:>10.2f}{read_time:>9.2f}{decompress_time:>10.2f}{load_time:>9.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
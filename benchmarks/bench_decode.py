@@ -0,0 +1,73 @@
+"""
+Compare per-match latency of decoding events into dataclasses.
+
+    python benchmarks/bench_decode.py [--matches 10] [--events 3500]
+
+Each response is decoded from (already parsed) JSON, so only the dataclass
+decoding is timed.
+"""
+import argparse
+import json
+import statistics
+import time
+
+import statsbombapi.dataframe
+import statsbombapi.frame
+import statsbombapi.json as sb_json
+import statsbombapi.json.codegen
+import statsbombapi.json.project
+import synthetic
+
+
+def _uncached_schema(response):
+    # How `parse_events` worked before schemas were cached
+    return sb_json.data.Event.schema().load(response, many=True)
+
+
+DECODERS = {
+    'schema per match': _uncached_schema,
+    'parse_events': sb_json.parse_events,
+    'codegen': sb_json.codegen.parse_events,
+    'lazy (type only)': lambda response: [e.type for e in sb_json.lazy.parse_events(response)],
+    'codegen (shots)': lambda response: sb_json.codegen.parse_events(sb_json.project.EventProjection(['Shot'])(response)),
+}
+if statsbombapi.frame.np is not None:
+    DECODERS['EventsFrame'] = statsbombapi.frame.events_frame
+if statsbombapi.dataframe.pd is not None:
+    DECODERS['pd.DataFrame (nested)'] = statsbombapi.dataframe.pd.DataFrame
+    DECODERS['dataframe'] = lambda response: statsbombapi.dataframe.dataframe('events', response)
+
+
+def _time(decode, responses):
+    latencies = []
+    for response in responses:
+        start = time.perf_counter()
+        decode(response)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=10)
+    parser.add_argument('--events', type=int, default=synthetic.EVENTS_PER_MATCH)
+    args = parser.parse_args()
+
+    season = synthetic.season_events(n_matches=args.matches, n_events=args.events)
+    responses = [json.loads(content) for content in season.values()]
+
+    start = time.perf_counter()
+    sb_json.warmup()
+    print(f'warmup: {(time.perf_counter() - start) * 1000:.1f} ms')
+    print(f'{args.matches} matches, {args.events} events per match\n')
+    print(f'{"decoder":<20}{"mean ms":>10}{"median ms":>11}{"max ms":>10}')
+    for name, decode in DECODERS.items():
+        latencies = _time(decode, responses)
+        print(
+            f'{name:<20}{statistics.mean(latencies) * 1000:>10.1f}'
+            f'{statistics.median(latencies) * 1000:>11.1f}{max(latencies) * 1000:>10.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
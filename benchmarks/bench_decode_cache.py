@@ -0,0 +1,49 @@
+"""
+Compare decoding raw events with and without a `decoders.CachingDecoder`, on a
+cold cache (which decodes and stores each result) and a warm one.
+
+    python benchmarks/bench_decode_cache.py [--matches 5]
+
+The cache is written to a temporary directory.
+"""
+import argparse
+import tempfile
+import time
+
+import statsbombapi.decoders
+import synthetic
+
+
+DECODERS = {
+    'DataclassDecoder': statsbombapi.decoders.DataclassDecoder,
+    'FastDataclassDecoder': statsbombapi.decoders.FastDataclassDecoder,
+}
+if statsbombapi.decoders.frame.np is not None:
+    DECODERS['EventsFrameDecoder'] = statsbombapi.decoders.EventsFrameDecoder
+
+
+def _time(decoder, payloads):
+    start = time.perf_counter()
+    for payload in payloads:
+        decoder.decode_events(payload)
+    return (time.perf_counter() - start) / len(payloads) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = list(synthetic.season_events(n_matches=args.matches).values())
+    print(f'{args.matches} matches\n')
+    print(f'{"decoder":<22}{"uncached ms":>13}{"cold ms":>10}{"warm ms":>10}')
+    for name, make_decoder in DECODERS.items():
+        uncached = _time(make_decoder(), payloads)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = _time(statsbombapi.decoders.CachingDecoder(make_decoder(), cache_dir), payloads)
+            warm = _time(statsbombapi.decoders.CachingDecoder(make_decoder(), cache_dir), payloads)
+        print(f'{name:<22}{uncached:>13.1f}{cold:>10.1f}{warm:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
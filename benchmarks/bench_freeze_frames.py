@@ -0,0 +1,54 @@
+"""
+Compare building padded freeze frame arrays for a season's shots from decoded
+dataclasses (with nested loops) and with `frame.freeze_frames`.
+
+    python benchmarks/bench_freeze_frames.py [--matches 38]
+
+Both start from (already parsed) JSON.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import statsbombapi.frame
+import statsbombapi.json.codegen
+import statsbombapi.json.project
+import synthetic
+
+
+def _from_dataclasses(responses):
+    shots = [
+        event
+        for response in responses
+        for event in statsbombapi.json.codegen.parse_events(statsbombapi.json.project.EventProjection(['Shot'])(response))
+    ]
+    n_players = max(len(shot.shot.freeze_frame or ()) for shot in shots)
+    features = np.zeros((len(shots), n_players, 4), dtype='float32')
+    mask = np.zeros((len(shots), n_players), dtype=bool)
+    for i, shot in enumerate(shots):
+        for j, player in enumerate(shot.shot.freeze_frame or ()):
+            features[i, j] = (player.location[0], player.location[1], player.teammate, player.position.id)
+            mask[i, j] = True
+    return features, mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=38)
+    args = parser.parse_args()
+
+    responses = [json.loads(content) for content in synthetic.season_events(n_matches=args.matches).values()]
+    n_shots = len(statsbombapi.frame.freeze_frames(responses))
+    print(f'{args.matches} matches, {n_shots} shots\n')
+
+    print(f'{"method":<20}{"time ms":>10}')
+    for name, extract in [('dataclasses', _from_dataclasses), ('freeze_frames', statsbombapi.frame.freeze_frames)]:
+        start = time.perf_counter()
+        extract(responses)
+        print(f'{name:<20}{(time.perf_counter() - start) * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare decode time and retained memory when decoding a season of events with
+`codegen.parse_events`, with and without an `InternPool` shared across matches.
+
+    python benchmarks/bench_intern.py [--matches 20]
+
+Memory is measured with tracemalloc (which slows decoding down), so the timings
+are taken in a separate, untraced run.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import statsbombapi.json as sb_json
+import statsbombapi.json.codegen
+import synthetic
+
+
+def _decode(responses, pool):
+    return [sb_json.codegen.parse_events(response, pool) for response in responses]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=20)
+    args = parser.parse_args()
+
+    responses = [json.loads(content) for content in synthetic.season_events(n_matches=args.matches).values()]
+    _decode(responses[:1], None)
+
+    print(f'{args.matches} matches\n')
+    print(f'{"mode":<10}{"time s":>9}{"retained MiB":>14}')
+    for name, make_pool in [('plain', lambda: None), ('interned', sb_json.InternPool)]:
+        start = time.perf_counter()
+        _decode(responses, make_pool())
+        elapsed = time.perf_counter() - start
+
+        pool = make_pool()
+        tracemalloc.start()
+        events = _decode(responses, pool)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del events
+        print(f'{name:<10}{elapsed:>9.2f}{retained / 2**20:>14.1f}')
+
+    stats = pool.stats()
+    print(
+        f'\n{len(pool)} canonical instances, {stats.hits} hits ({stats.hit_rate:.1%}), '
+        f'~{stats.bytes_saved / 2**20:.1f} MiB of duplicate instances saved'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare the time taken to parse a real-size events response with each installed
+JSON backend of `decoders.JsonDecoder`.
+
+    python benchmarks/bench_json.py [--events 3500] [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+
+import statsbombapi.decoders
+import synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=synthetic.EVENTS_PER_MATCH)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    content = next(iter(synthetic.season_events(n_matches=1, n_events=args.events).values()))
+    print(f'{args.events} events, {len(content) / 2**20:.1f} MiB\n')
+    print(f'{"backend":<12}{"mean ms":>10}{"min ms":>10}{"MiB/s":>10}')
+
+    expected = None
+    for backend in statsbombapi.decoders.available_json_backends():
+        decoder = statsbombapi.decoders.JsonDecoder(backend)
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            decoded = decoder.decode_events(content)
+            latencies.append(time.perf_counter() - start)
+        if expected is None:
+            expected = decoded
+        assert decoded == expected, f'{backend} decoded differently'
+        print(
+            f'{backend:<12}{statistics.mean(latencies) * 1000:>10.1f}{min(latencies) * 1000:>10.1f}'
+            f'{len(content) / 2**20 / min(latencies):>10.0f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
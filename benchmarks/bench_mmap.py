@@ -0,0 +1,77 @@
+"""
+Compare peak memory when decoding a season of events read by `LocalLoader` into
+`bytes` (the default) or memory-mapped (`mmap=True`).
+
+    python benchmarks/bench_mmap.py [--matches 380] [--decoder json|dataclass]
+
+Each mode runs in a fresh process. Reported are the peak Python heap (from
+tracemalloc, which excludes the memory-mapped file) and the peak resident set
+size (which includes any mapped pages that have been touched, although these are
+file-backed and can be reclaimed by the OS without swapping).
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+import statsbombapi
+import synthetic
+
+
+DECODERS = {
+    'json': statsbombapi.decoders.JsonDecoder,
+    'dataclass': statsbombapi.decoders.DataclassDecoder,
+}
+
+
+def _child(base_dir, use_mmap, decoder_name):
+    loader = statsbombapi.loaders.LocalLoader(base_dir, 'json', mmap=use_mmap)
+    decoder = DECODERS[decoder_name]()
+    match_ids = sorted(int(f.split('.')[0]) for f in os.listdir(os.path.join(base_dir, 'events')))
+
+    tracemalloc.start()
+    for match_id in match_ids:
+        events = decoder.decode_events(loader.load_events(match_id))
+        del events
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{heap_peak} {rss_peak * 1024}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=synthetic.MATCHES_PER_SEASON)
+    parser.add_argument('--decoder', choices=sorted(DECODERS), default='json')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        base_dir, mode = args.child
+        return _child(base_dir, mode == 'mmap', args.decoder)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        os.makedirs(os.path.join(base_dir, 'events'))
+        season = synthetic.season_events(n_matches=args.matches)
+        for match_id, content in season.items():
+            with open(os.path.join(base_dir, 'events', f'{match_id}.json'), 'wb') as fp:
+                fp.write(content)
+        largest = max(map(len, season.values()))
+        del season
+
+        print(f'{args.matches} matches, largest events file {largest / 2**20:.1f} MiB, {args.decoder} decoder\n')
+        print(f'{"mode":<8}{"peak heap MiB":>15}{"peak RSS MiB":>15}')
+        for mode in ('bytes', 'mmap'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--decoder', args.decoder, '--child', base_dir, mode],
+                check=True, capture_output=True, text=True
+            ).stdout
+            heap_peak, rss_peak = map(int, output.split())
+            print(f'{mode:<8}{heap_peak / 2**20:>15.1f}{rss_peak / 2**20:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Measure the throughput of decoding a season of events on a pool of processes,
+by number of workers.
+
+    python benchmarks/bench_parallel.py [--matches 38] [--decoder frame|arrow|dataclasses]
+
+Each row includes sending the raw payloads to the workers, sending the results
+back and merging them. The serial row decodes in this process.
+"""
+import argparse
+import os
+import time
+
+import statsbombapi.decoders
+import statsbombapi.parallel
+import synthetic
+
+
+DECODERS = {
+    'frame': statsbombapi.decoders.EventsFrameDecoder,
+    'arrow': statsbombapi.decoders.ArrowDecoder,
+    'dataclasses': statsbombapi.decoders.FastDataclassDecoder,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=38)
+    parser.add_argument('--decoder', choices=DECODERS, default='frame')
+    args = parser.parse_args()
+
+    payloads = synthetic.season_events(n_matches=args.matches)
+    decoder = DECODERS[args.decoder]()
+
+    start = time.perf_counter()
+    statsbombapi.parallel.merge({match_id: decoder.decode_events(p) for match_id, p in payloads.items()})
+    serial = time.perf_counter() - start
+    print(f'{args.matches} matches, {args.decoder} decoder, {os.cpu_count()} CPUs\n')
+    print(f'{"workers":<10}{"matches/s":>11}{"speed-up":>10}')
+    print(f'{"serial":<10}{args.matches / serial:>11.1f}{1:>10.2f}')
+
+    workers = 1
+    while workers <= os.cpu_count():
+        with statsbombapi.parallel.ParallelDecoder(decoder, max_workers=workers) as parallel:
+            # Start the workers before timing
+            list(parallel.map('competitions', [b'[]'] * workers))
+            start = time.perf_counter()
+            parallel.events(payloads)
+            elapsed = time.perf_counter() - start
+        print(f'{workers:<10}{args.matches / elapsed:>11.1f}{serial / elapsed:>10.2f}')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
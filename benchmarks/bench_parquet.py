@@ -0,0 +1,59 @@
+"""
+Compare loading a season of events from a Parquet dataset with decoding the raw
+JSON of each match.
+
+    python benchmarks/bench_parquet.py [--matches 38]
+
+The dataset is written to a temporary directory first. Reading a few columns
+only touches those columns' pages, so is much faster than reading them all.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import statsbombapi.json.codegen
+import statsbombapi.parquet
+import synthetic
+
+
+COLUMNS = ['match_id', 'type_name', 'player_id', 'location_x', 'location_y', 'shot_statsbomb_xg']
+
+
+def _size(directory):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(directory) for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--matches', type=int, default=38)
+    args = parser.parse_args()
+
+    season = synthetic.season_events(n_matches=args.matches)
+    raw_size = sum(len(content) for content in season.values())
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        writer = statsbombapi.parquet.ParquetWriter(base_dir)
+        start = time.perf_counter()
+        for match_id, content in season.items():
+            writer.write_events(1, 1, match_id, json.loads(content))
+        write_time = time.perf_counter() - start
+        print(f'{args.matches} matches: {raw_size / 2**20:.1f} MiB of JSON, '
+              f'{_size(base_dir) / 2**20:.1f} MiB of Parquet (written in {write_time:.1f} s)\n')
+
+        reader = statsbombapi.parquet.ParquetReader(base_dir)
+        timings = {
+            'json + codegen': lambda: [statsbombapi.json.codegen.parse_events(json.loads(c)) for c in season.values()],
+            'parquet (all columns)': lambda: reader.events(competition_id=1, season_id=1),
+            f'parquet ({len(COLUMNS)} columns)': lambda: reader.events(competition_id=1, season_id=1, columns=COLUMNS),
+        }
+        print(f'{"load":<26}{"time s":>9}')
+        for name, load in timings.items():
+            start = time.perf_counter()
+            load()
+            print(f'{name:<26}{time.perf_counter() - start:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare the memory taken per 100k decoded events by the `data` dataclasses and
+their `slotted` variants, with and without interning.
+
+    python benchmarks/bench_slots.py [--events 100000]
+
+Memory is the traced (tracemalloc) size of the decoded events, excluding the
+parsed JSON they were decoded from.
+"""
+import argparse
+import json
+import tracemalloc
+
+import statsbombapi.json as sb_json
+import statsbombapi.json.codegen
+import synthetic
+
+
+MODES = {
+    'dict': dict(slots=False, intern=False),
+    'slots': dict(slots=True, intern=False),
+    'dict + intern': dict(slots=False, intern=True),
+    'slots + intern': dict(slots=True, intern=True),
+}
+
+
+def _measure(responses, slots, intern):
+    pool = sb_json.InternPool() if intern else None
+    tracemalloc.start()
+    events = [sb_json.codegen.parse_events(response, pool, slots) for response in responses]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100_000)
+    args = parser.parse_args()
+
+    n_matches = -(-args.events // synthetic.EVENTS_PER_MATCH)
+    season = synthetic.season_events(n_matches=n_matches)
+    responses = [json.loads(content) for content in season.values()]
+    n_events = sum(map(len, responses))
+    del season
+
+    print(f'{n_events} events ({n_matches} matches)\n')
+    print(f'{"mode":<16}{"MiB per 100k events":>21}{"bytes per event":>17}')
+    for name, options in MODES.items():
+        size = _measure(responses, **options)
+        print(f'{name:<16}{size / n_events * 100_000 / 2**20:>21.1f}{size / n_events:>17.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Generate synthetic (but realistically shaped) StatsBomb responses for benchmarking
+"""
+import json
+import random
+import uuid
+
+
+EVENTS_PER_MATCH = 3500
+MATCHES_PER_SEASON = 380
+
+_TEAMS = [{'id': 100 + i, 'name': f'Team {i}'} for i in range(20)]
+_POSITIONS = [{'id': i, 'name': f'Position {i}'} for i in range(1, 26)]
+_PLAY_PATTERNS = [{'id': i, 'name': f'Play Pattern {i}'} for i in range(1, 10)]
+_BODY_PARTS = [{'id': 38, 'name': 'Left Foot'}, {'id': 40, 'name': 'Right Foot'}, {'id': 37, 'name': 'Head'}]
+_HEIGHTS = [{'id': 1, 'name': 'Ground Pass'}, {'id': 2, 'name': 'Low Pass'}, {'id': 3, 'name': 'High Pass'}]
+_OUTCOMES = [{'id': 9, 'name': 'Incomplete'}, {'id': 74, 'name': 'Injury Clearance'}, {'id': 75, 'name': 'Out'}]
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _location(rng):
+    return [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]
+
+
+def _timestamp(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    return f'{int(minutes // 60):02d}:{int(minutes % 60):02d}:{int(seconds):02d}.{int(seconds % 1 * 1000):03d}'
+
+
+def _player(team_index, number):
+    player_id = 10000 + 100 * team_index + number
+    return {'id': player_id, 'name': f'Player {player_id}'}
+
+
+def _freeze_frame(rng, team_index, opponent_index):
+    frame = []
+    for _ in range(rng.randint(8, 20)):
+        teammate = rng.random() < 0.4
+        frame.append({
+            'location': _location(rng),
+            'player': _player(team_index if teammate else opponent_index, rng.randint(1, 11)),
+            'position': rng.choice(_POSITIONS),
+            'teammate': teammate,
+        })
+    return frame
+
+
+def events(rng, home_index=0, away_index=1, n_events=EVENTS_PER_MATCH):
+    """ A list of raw events for a single match. """
+    result = []
+    for index in range(1, n_events + 1):
+        seconds = 5400 * index / n_events
+        period = 1 if seconds < 2700 else 2
+        team_index = rng.choice((home_index, away_index))
+        opponent_index = away_index if team_index == home_index else home_index
+        team = _TEAMS[team_index]
+        event = {
+            'id': _uuid(rng),
+            'index': index,
+            'period': period,
+            'timestamp': _timestamp(seconds % 2700),
+            'minute': int(seconds // 60),
+            'second': int(seconds % 60),
+            'possession': index // 10 + 1,
+            'possession_team': team,
+            'play_pattern': rng.choice(_PLAY_PATTERNS),
+            'team': team,
+            'player': _player(team_index, rng.randint(1, 11)),
+            'position': rng.choice(_POSITIONS),
+            'location': _location(rng),
+            'duration': round(rng.uniform(0, 3), 6),
+            'related_events': [_uuid(rng) for _ in range(rng.randint(0, 3))],
+        }
+        if rng.random() < 0.1:
+            event['under_pressure'] = True
+
+        kind = rng.random()
+        if kind < 0.3:
+            event['type'] = {'id': 30, 'name': 'Pass'}
+            event['pass'] = {
+                'recipient': _player(team_index, rng.randint(1, 11)),
+                'length': round(rng.uniform(1, 60), 7),
+                'angle': round(rng.uniform(-3.14, 3.14), 7),
+                'height': rng.choice(_HEIGHTS),
+                'end_location': _location(rng),
+                'body_part': rng.choice(_BODY_PARTS),
+            }
+            if rng.random() < 0.2:
+                event['pass']['outcome'] = rng.choice(_OUTCOMES)
+        elif kind < 0.55:
+            event['type'] = {'id': 42, 'name': 'Ball Receipt*'}
+        elif kind < 0.8:
+            event['type'] = {'id': 43, 'name': 'Carry'}
+            event['carry'] = {'end_location': _location(rng)}
+        elif kind < 0.9:
+            event['type'] = {'id': 17, 'name': 'Pressure'}
+        elif kind < 0.907:
+            event['type'] = {'id': 16, 'name': 'Shot'}
+            event['shot'] = {
+                'statsbomb_xg': round(rng.uniform(0, 1), 8),
+                'end_location': _location(rng) + [round(rng.uniform(0, 3), 1)],
+                'key_pass_id': _uuid(rng),
+                'body_part': rng.choice(_BODY_PARTS),
+                'type': {'id': 87, 'name': 'Open Play'},
+                'outcome': {'id': 98, 'name': 'Off T'},
+                'technique': {'id': 93, 'name': 'Normal'},
+                'freeze_frame': _freeze_frame(rng, team_index, opponent_index),
+            }
+        else:
+            event['type'] = {'id': 4, 'name': 'Duel'}
+            event['duel'] = {
+                'type': {'id': 11, 'name': 'Tackle'},
+                'outcome': {'id': 4, 'name': 'Won'},
+            }
+        result.append(event)
+    return result
+
+
+def season_events(n_matches=MATCHES_PER_SEASON, n_events=EVENTS_PER_MATCH, seed=0):
+    """ Raw (JSON-encoded) events for each match in a season, keyed by match id. """
+    rng = random.Random(seed)
+    return {
+        match_id: json.dumps(events(rng, *rng.sample(range(len(_TEAMS)), 2), n_events=n_events)).encode('utf8')
+        for match_id in range(1, n_matches + 1)
+    }
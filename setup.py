@@ -1,3 +1,5 @@
+import re
+
 import setuptools
 
 from distutils.core import setup
@@ -6,10 +8,14 @@ from distutils.core import setup
 with open('README.md', 'r', encoding='utf8') as f:
     readme = f.read()
 
+# NOTE: read (rather than import) the version, since the dependencies may not be installed yet
+with open('statsbombapi/__init__.py', 'r', encoding='utf8') as f:
+    version = re.search(r"^__version__ = '([^']+)'", f.read(), re.MULTILINE).group(1)
+
 setup(
     name='statsbombapi',
     description='A wrapper for the Statsbomb API and public data.',
-    version='0.1.0-dev',
+    version=version,
     packages=setuptools.find_packages(),
     author='Ben Torvaney',
     author_email='torvaney@protonmail.com',
@@ -22,6 +28,12 @@ setup(
         'requests>=2.23.0'
     ],
     extras_require={
+        'zstd': ['zstandard'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson'],
+        'numpy': ['numpy'],
+        'parquet': ['pyarrow'],
+        'pandas': ['pandas'],
         'dev': [
             'pytest',
             'ipython',
@@ -1,7 +1,13 @@
+__version__ = '0.1.0-dev'
+
 from .json import *
 from .client import (
     APIClient,
     StatsbombPublic,
     StatsbombAPI,
+    AsyncAPIClient,
+    AsyncStatsbombPublic,
+    AsyncStatsbombAPI,
 )
 from .loaders import StatsbombAPIException
+from . import pack, sync
@@ -0,0 +1,49 @@
+"""
+Arrow tables of API responses, with a column per (flattened) field
+
+See `flatten` for the columns of each route. Each route's tables have the same
+schema whichever fields happen to be present, so tables of different responses
+(e.g. a season's events) can be concatenated or written to the same dataset.
+"""
+import typing
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from . import flatten
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError('Arrow tables require the `pyarrow` package (`pip install pyarrow`)')
+
+
+def _arrow_type(kind):
+    return {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'str': pa.string(),
+        'enum': pa.string(),
+        'uuid': pa.string(),
+        'json': pa.string(),
+        'date': pa.date32(),
+        'time': pa.time64('us'),
+        'datetime': pa.timestamp('us'),
+    }[kind]
+
+
+def schema(route: str) -> 'pa.Schema':
+    """ The schema of `route`'s tables. """
+    _require_pyarrow()
+    return pa.schema([(column.name, _arrow_type(column.kind)) for column in flatten.columns(route)])
+
+
+def table(route: str, response: typing.List[typing.Dict[str, typing.Any]]) -> 'pa.Table':
+    """ A (parsed) response of `route` as an Arrow table. """
+    route_schema = schema(route)
+    flattened = flatten.flatten(route, response)
+    arrays = [pa.array(flattened[field.name], field.type) for field in route_schema]
+    return pa.Table.from_arrays(arrays, schema=route_schema)
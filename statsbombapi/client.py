@@ -1,4 +1,10 @@
+import concurrent.futures
+import contextlib
+import pickle
+import warnings
+
 from . import loaders, decoders
+from .json.project import EventProjection
 
 
 class APIClient:
@@ -21,10 +27,127 @@ class APIClient:
             self.loader.load_lineups(match_id)
         )
 
-    def events(self, match_id):
-        return self.decoder.decode_events(
-            self.loader.load_events(match_id)
-        )
+    def events(self, match_id, types=None, fields=None):
+        """
+        Decode the events of a match.
+
+        To decode only some events, pass the event `types` (ids or names) to keep
+        and/or the `fields` of each event to keep (see `json.project.EventProjection`).
+        These are selected from the parsed JSON, so the events that are dropped
+        are never decoded into dataclasses. The decoder must support this with a
+        `project_events` method (as `JsonDecoder`, and the `CompositeDecoder`s
+        that use it, do).
+        """
+        return _decode_events(self.decoder, self.loader.load_events(match_id), types, fields)
+
+    def iter_events(self, match_id):
+        """
+        Yield the events of a match one by one, decoded as the response is read.
+
+        With a loader that streams its responses (e.g. `OpenDataLoader(stream=True)`)
+        the full response is never held in memory. The decoder must support this with
+        a `decode_events_iter` method (as the `CompositeDecoder`s of `JsonDecoder` or
+        `StreamingJsonDecoder` and a dataclass decoder do), and events are decoded to
+        the same type as by `events`.
+        """
+        decode = getattr(self.decoder, 'decode_events_iter', None)
+        if decode is None:
+            raise TypeError(f'{type(self.decoder).__name__} cannot decode events one by one')
+        return decode(self.loader.load_events(match_id))
+
+    def lineups_many(self, match_ids, max_workers=8, decode_workers=None):
+        """
+        Fetch and decode the lineups for each of `match_ids`.
+
+        See `events_many`.
+        """
+        return self._many('lineups', match_ids, max_workers, decode_workers)
+
+    def events_many(self, match_ids, max_workers=8, decode_workers=None):
+        """
+        Fetch and decode the events for each of `match_ids`.
+
+        Responses are fetched on a pool of `max_workers` threads and decoded on a
+        pool of `decode_workers` processes (default: one per CPU), so the decoder
+        must be picklable. Use `decode_workers=0` to decode on the fetching threads
+        instead. If the decoder can't be pickled, it's used on the fetching threads
+        (with a warning) by default, and a `TypeError` is raised if `decode_workers`
+        was given.
+
+        Yields `(match_id, result)` pairs in order of completion. If fetching or
+        decoding a match fails, `result` is the exception that was raised, and the
+        remaining matches are still processed.
+        """
+        return self._many('events', match_ids, max_workers, decode_workers)
+
+    def _many(self, route, match_ids, max_workers, decode_workers):
+        decode = getattr(self.decoder, f'decode_{route}')
+        if decode_workers != 0:
+            # Check once, rather than failing for every match
+            try:
+                pickle.dumps(decode)
+            except Exception as e:
+                if decode_workers is not None:
+                    raise TypeError(f'{type(self.decoder).__name__} cannot be sent to decode_workers: {e}') from e
+                warnings.warn(
+                    f'{type(self.decoder).__name__} cannot be pickled ({e}), so is decoding on the fetching threads',
+                    RuntimeWarning
+                )
+                decode_workers = 0
+        return self._iter_many(route, match_ids, max_workers, decode_workers)
+
+    def _iter_many(self, route, match_ids, max_workers, decode_workers):
+        load = getattr(self.loader, f'load_{route}')
+        decode = getattr(self.decoder, f'decode_{route}')
+        decode_in_thread = decode_workers == 0
+
+        def fetch(match_id):
+            raw = load(match_id)
+            return decode(raw) if decode_in_thread else raw
+
+        # Bound the number of payloads held in memory at once
+        max_in_flight = 2 * max_workers
+        match_ids = iter(match_ids)
+        pending = {}
+
+        with contextlib.ExitStack() as stack:
+            fetch_pool = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers))
+            if not decode_in_thread:
+                decode_pool = stack.enter_context(concurrent.futures.ProcessPoolExecutor(decode_workers))
+            stack.callback(_cancel_all, pending)
+
+            def fill():
+                for match_id in match_ids:
+                    pending[fetch_pool.submit(fetch, match_id)] = (match_id, 'fetch')
+                    if len(pending) >= max_in_flight:
+                        break
+
+            fill()
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    match_id, stage = pending.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        yield match_id, error
+                    elif stage == 'fetch' and not decode_in_thread:
+                        pending[decode_pool.submit(decode, future.result())] = (match_id, 'decode')
+                    else:
+                        yield match_id, future.result()
+                fill()
+
+
+def _decode_events(decoder, s, types, fields):
+    if types is None and fields is None:
+        return decoder.decode_events(s)
+    if not hasattr(decoder, 'project_events'):
+        raise TypeError(f'{type(decoder).__name__} does not support selecting types or fields')
+    return decoder.project_events(s, EventProjection(types, fields))
+
+
+def _cancel_all(futures):
+    for future in futures:
+        future.cancel()
 
 
 class StatsbombPublic(APIClient):
@@ -40,3 +163,58 @@ class StatsbombAPI(APIClient):
             password=password
         )
         self.decoder = decoder
+
+
+class AsyncAPIClient:
+    """
+    Asynchronous counterpart of `APIClient`.
+
+    `loader` must provide coroutine `load_*` methods (for example, `loaders.AsyncLoader`).
+    Any decoder that works with `APIClient` works here too.
+    """
+    def __init__(self, loader, decoder):
+        self.loader = loader
+        self.decoder = decoder
+
+    async def competitions(self):
+        return self.decoder.decode_competitions(
+            await self.loader.load_competitions()
+        )
+
+    async def matches(self, competition_id, season_id):
+        return self.decoder.decode_matches(
+            await self.loader.load_matches(competition_id, season_id)
+        )
+
+    async def lineups(self, match_id):
+        return self.decoder.decode_lineups(
+            await self.loader.load_lineups(match_id)
+        )
+
+    async def events(self, match_id, types=None, fields=None):
+        return _decode_events(self.decoder, await self.loader.load_events(match_id), types, fields)
+
+    def close(self):
+        self.loader.close()
+
+
+class AsyncStatsbombPublic(AsyncAPIClient):
+    def __init__(self, decoder=decoders.DataclassDecoder(), max_concurrency=16):
+        self.loader = loaders.AsyncLoader(
+            loaders.OpenDataLoader(pool_maxsize=max_concurrency),
+            max_concurrency=max_concurrency
+        )
+        self.decoder = decoder
+
+
+class AsyncStatsbombAPI(AsyncAPIClient):
+    def __init__(self, username, password, decoder=decoders.DataclassDecoder(), max_concurrency=16):
+        self.loader = loaders.AsyncLoader(
+            loaders.StatsbombAPILoader(
+                username=username,
+                password=password,
+                pool_maxsize=max_concurrency
+            ),
+            max_concurrency=max_concurrency
+        )
+        self.decoder = decoder
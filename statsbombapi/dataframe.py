@@ -0,0 +1,83 @@
+"""
+Typed pandas DataFrames of API responses, with a column per (flattened) field
+
+See `flatten` for the columns of each route. Missing values are kept missing,
+using pandas' nullable dtypes:
+
+    int                         Int64
+    float                       float64 (NaN)
+    bool                        boolean
+    str, UUID and JSON text     string
+    enum                        category
+    date and datetime           datetime64
+    time                        timedelta64 (since midnight, e.g. an event's
+                                `timestamp` within its period)
+"""
+import datetime
+import typing
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = pd = None
+
+from . import flatten
+
+
+def _require_pandas():
+    if pd is None:
+        raise ImportError('DataFrames require the `pandas` package (`pip install pandas`)')
+
+
+def _microseconds(t: typing.Optional[datetime.time]):
+    if t is None:
+        return None
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+def _missing_array(kind, n):
+    if kind == 'int':
+        return pd.arrays.IntegerArray(np.zeros(n, dtype='int64'), np.ones(n, dtype=bool))
+    if kind == 'bool':
+        return pd.arrays.BooleanArray(np.zeros(n, dtype=bool), np.ones(n, dtype=bool))
+    if kind == 'float':
+        return np.full(n, np.nan)
+    return None
+
+
+def _array(kind, values):
+    if values.count(None) == len(values):
+        # Most of the events' columns are for other event types
+        missing = _missing_array(kind, len(values))
+        if missing is not None:
+            return missing
+    if kind in ('int', 'bool'):
+        # NOTE: building the masked arrays directly is much faster than letting
+        # pandas coerce lists containing None (ids fit exactly in a float64)
+        floats = np.array(values, dtype='float64')
+        mask = np.isnan(floats)
+        if kind == 'int':
+            return pd.arrays.IntegerArray(np.where(mask, 0, floats).astype('int64'), mask)
+        return pd.arrays.BooleanArray(floats == 1, mask)
+    if kind == 'float':
+        return np.array(values, dtype='float64')
+    if kind == 'enum':
+        return pd.Categorical(values)
+    if kind == 'date':
+        return np.array(values, dtype='datetime64[D]').astype('datetime64[s]')
+    if kind == 'datetime':
+        return np.array(values, dtype='datetime64[us]')
+    if kind == 'time':
+        return np.array([_microseconds(v) for v in values], dtype='float64').astype('timedelta64[us]')
+    return pd.array(values, dtype='string')
+
+
+def dataframe(route: str, response: typing.List[typing.Dict[str, typing.Any]]) -> 'pd.DataFrame':
+    """ A (parsed) response of `route` as a DataFrame. """
+    _require_pandas()
+    flattened = flatten.flatten(route, response)
+    return pd.DataFrame({
+        column.name: _array(column.kind, flattened[column.name])
+        for column in flatten.columns(route)
+    })
@@ -1,7 +1,28 @@
+import dataclasses
 import functools
+import hashlib
 import json
+import os
+import pickle
 
-from .json import parse
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simplejson
+except ImportError:
+    simplejson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+from . import __version__, flatten, storage
+from .json import codegen, data, lazy, parse, stream
+from .json.intern import InternPool
 
 
 class UniformDecoder:
@@ -21,9 +42,93 @@ class UniformDecoder:
         return self.decode(s)
 
 
+def _json_loads(s):
+    # Decode buffers (e.g. memory-mapped files) straight to text, without
+    # copying them to `bytes` first
+    if isinstance(s, memoryview):
+        s = str(s, 'utf8')
+    return json.loads(s)
+
+
+def _orjson_loads(s):
+    # orjson reads buffers (including memoryviews) directly
+    return orjson.loads(s)
+
+
+def _simplejson_loads(s):
+    if isinstance(s, memoryview):
+        s = str(s, 'utf8')
+    return simplejson.loads(s)
+
+
+def _ujson_loads(s):
+    if isinstance(s, memoryview):
+        s = str(s, 'utf8')
+    return ujson.loads(s)
+
+
+# In order of preference
+JSON_BACKENDS = {
+    'orjson': _orjson_loads,
+    'ujson': _ujson_loads,
+    'simplejson': _simplejson_loads,
+    'json': _json_loads,
+}
+
+
+def available_json_backends():
+    """ The names of the installed JSON backends, fastest first. """
+    installed = {'orjson': orjson, 'ujson': ujson, 'simplejson': simplejson, 'json': json}
+    return [name for name in JSON_BACKENDS if installed[name] is not None]
+
+
 class JsonDecoder(UniformDecoder):
+    """
+    Decode responses with `json.loads`, or a faster drop-in replacement.
+
+    `backend` is one of `JSON_BACKENDS`. By default, the fastest installed
+    backend is used.
+    """
+    def __init__(self, backend=None):
+        available = available_json_backends()
+        if backend is None:
+            backend = available[0]
+        elif backend not in JSON_BACKENDS:
+            raise ValueError(f'Unknown JSON backend: {backend}')
+        elif backend not in available:
+            raise ImportError(f'The {backend} JSON backend requires the `{backend}` package (`pip install {backend}`)')
+        self.backend = backend
+        self.decode = JSON_BACKENDS[backend]
+
+    def project_events(self, s, projection):
+        return projection(self.decode(s))
+
+    def decode_events_iter(self, s):
+        # Whichever the backend, only the streaming parser can yield events as they're read
+        return stream.iter_array(s)
+
+
+class StreamingJsonDecoder(UniformDecoder):
+    """
+    Decode responses incrementally, as they are read.
+
+    Accepts anything `JsonDecoder` does, as well as iterables of `bytes` chunks and
+    file-like objects (as returned by loaders created with `stream=True`), so the
+    full raw response is never held in memory.
+    """
     def __init__(self):
-        self.decode = json.loads
+        self.decode = _decode_stream
+
+    def project_events(self, s, projection):
+        # Drop events as they're read
+        return projection(stream.iter_array(s))
+
+    def decode_events_iter(self, s):
+        return stream.iter_array(s)
+
+
+def _decode_stream(s):
+    return list(stream.iter_array(s))
 
 
 class BaseDataclassDecoder:
@@ -39,6 +144,57 @@ class BaseDataclassDecoder:
     def decode_events(self, s):
         return parse.parse_events(s)
 
+    def decode_events_iter(self, events):
+        event_schema = parse.schema(data.Event)
+        return (event_schema.load(event) for event in events)
+
+
+class BaseFastDataclassDecoder:
+    """
+    Decode into the same dataclasses as `BaseDataclassDecoder`, with functions
+    generated for each dataclass (see `json.codegen`) instead of `dataclasses_json`.
+
+    With `lazy_events=True`, events are decoded to `json.lazy.LazyEvent`s, which
+    only decode each field when it is first accessed.
+
+    With `intern=True`, repeated teams, players and so on within each response are
+    decoded to a single shared instance. Pass an `InternPool` instead to share
+    instances (and collect stats) across responses.
+
+    With `slots=True`, responses are decoded to the more compact `json.slotted`
+    variants of the dataclasses (except for lazy events).
+    """
+    def __init__(self, lazy_events=False, intern=False, slots=False):
+        self.lazy_events = lazy_events
+        self.intern = intern
+        self.slots = slots
+
+    def _pool(self):
+        if self.intern is True:
+            return InternPool()
+        return self.intern or None
+
+    def decode_competitions(self, s):
+        return codegen.parse_competitions(s, self._pool(), self.slots)
+
+    def decode_matches(self, s):
+        return codegen.parse_matches(s, self._pool(), self.slots)
+
+    def decode_lineups(self, s):
+        return codegen.parse_lineups(s, self._pool(), self.slots)
+
+    def decode_events(self, s):
+        if self.lazy_events:
+            return lazy.parse_events(s)
+        return codegen.parse_events(s, self._pool(), self.slots)
+
+    def decode_events_iter(self, events):
+        if self.lazy_events:
+            return map(lazy.LazyEvent, events)
+        decode = codegen.decoder(data.Event, self.slots)
+        pool = self._pool()
+        return (decode(event, pool) for event in events)
+
 
 class CompositeDecoder:
     def __init__(self, *decoders):
@@ -61,7 +217,238 @@ class CompositeDecoder:
     def decode_events(self, s):
         return self._decode('decode_events', s)
 
+    def decode_events_iter(self, s):
+        """
+        Decode events one by one, as the response is read.
+
+        Each decoder must have a `decode_events_iter` method, which takes (and
+        returns) an iterable of events rather than a list.
+        """
+        funcs = [getattr(d, 'decode_events_iter', None) for d in self.decoders]
+        if any(f is None for f in funcs):
+            raise TypeError('Not all of the decoders can decode events one by one')
+        return functools.reduce(lambda x, f: f(x), funcs, s)
+
+    def project_events(self, s, projection):
+        """
+        Decode events, applying `projection` (a `json.project.EventProjection`) to
+        the parsed JSON before passing it on to any later decoders.
+        """
+        i = next((i for i, d in enumerate(self.decoders) if hasattr(d, 'project_events')), None)
+        if i is None:
+            raise TypeError('None of the decoders support projection (e.g. JsonDecoder)')
+        for decoder in self.decoders[:i]:
+            s = decoder.decode_events(s)
+        s = self.decoders[i].project_events(s, projection)
+        for decoder in self.decoders[i + 1:]:
+            s = decoder.decode_events(s)
+        return s
+
 
 class DataclassDecoder(CompositeDecoder):
     def __init__(self):
         self.decoders = (JsonDecoder(), BaseDataclassDecoder())
+
+
+class StreamingDataclassDecoder(CompositeDecoder):
+    def __init__(self):
+        self.decoders = (StreamingJsonDecoder(), BaseDataclassDecoder())
+
+
+class FastDataclassDecoder(CompositeDecoder):
+    def __init__(self, lazy_events=False, intern=False, slots=False):
+        self.decoders = (JsonDecoder(), BaseFastDataclassDecoder(lazy_events, intern, slots))
+
+
+class BaseEventsFrameDecoder(BaseFastDataclassDecoder):
+    """
+    Decode events into a columnar `frame.EventsFrame` (which requires numpy).
+
+    Other routes are decoded as by `BaseFastDataclassDecoder`.
+    """
+    def decode_events(self, s):
+        # NOTE: imported here, as numpy is slow to import and only needed by frames
+        from . import frame
+        return frame.events_frame(s)
+
+    # Frames are built from all of a match's events at once
+    decode_events_iter = None
+
+
+class EventsFrameDecoder(CompositeDecoder):
+    def __init__(self):
+        self.decoders = (JsonDecoder(), BaseEventsFrameDecoder())
+
+
+def _arrow_table(route, s):
+    # NOTE: imported here, as pyarrow is slow to import and only needed by Arrow tables
+    from . import arrow
+    return arrow.table(route, s)
+
+
+class BaseArrowDecoder:
+    """ Decode each route into an Arrow table (see `arrow`), which requires pyarrow. """
+    def decode_competitions(self, s):
+        return _arrow_table('competitions', s)
+
+    def decode_matches(self, s):
+        return _arrow_table('matches', s)
+
+    def decode_lineups(self, s):
+        return _arrow_table('lineups', s)
+
+    def decode_events(self, s):
+        return _arrow_table('events', s)
+
+
+class ArrowDecoder(CompositeDecoder):
+    def __init__(self):
+        self.decoders = (JsonDecoder(), BaseArrowDecoder())
+
+
+def _dataframe(route, s):
+    # NOTE: imported here, as pandas is slow to import and only needed by DataFrames
+    from . import dataframe
+    return dataframe.dataframe(route, s)
+
+
+class BaseDataFrameDecoder:
+    """
+    Decode each route into a typed pandas DataFrame (see `dataframe`), with nested
+    fields flattened into columns, e.g. `pass_end_location_x` or `shot_statsbomb_xg`.
+    """
+    def decode_competitions(self, s):
+        return _dataframe('competitions', s)
+
+    def decode_matches(self, s):
+        return _dataframe('matches', s)
+
+    def decode_lineups(self, s):
+        return _dataframe('lineups', s)
+
+    def decode_events(self, s):
+        return _dataframe('events', s)
+
+
+class DataFrameDecoder(CompositeDecoder):
+    def __init__(self):
+        self.decoders = (JsonDecoder(), BaseDataFrameDecoder())
+
+
+@functools.lru_cache(maxsize=None)
+def schema_version() -> str:
+    """
+    A fingerprint of the dataclasses in `json.data` and of the columns of the
+    columnar decoders, which changes whenever either does.
+    """
+    schema = []
+    for name, cls in sorted(vars(data).items()):
+        if isinstance(cls, type) and dataclasses.is_dataclass(cls):
+            schema.append((name, [(f.name, str(f.type)) for f in dataclasses.fields(cls)]))
+    from . import frame
+    schema.append(sorted(frame.COLUMNS.items()))
+    schema.append([flatten.columns(route) for route in storage.ROUTES])
+    return hashlib.blake2b(repr(schema).encode('utf8'), digest_size=8).hexdigest()
+
+
+def _decoder_key(decoder):
+    """ Identify a decoder by its class and (simple) settings, e.g. `lazy_events=True`. """
+    if isinstance(decoder, InternPool):
+        # Interning doesn't change the decoded values
+        return 'InternPool'
+    cls = type(decoder)
+    settings = []
+    for name, value in sorted(vars(decoder).items()):
+        if isinstance(value, (bool, int, float, str, type(None))):
+            settings.append(f'{name}={value!r}')
+        elif isinstance(value, tuple):
+            settings.append(f'{name}=({",".join(_decoder_key(d) for d in value)})')
+        elif callable(value):
+            # e.g. the function of a `UniformDecoder`
+            settings.append(f'{name}={getattr(value, "__module__", None)}.{getattr(value, "__qualname__", None)}')
+        elif hasattr(value, '__dict__'):
+            settings.append(f'{name}={_decoder_key(value)}')
+    return f'{cls.__module__}.{cls.__qualname__}({",".join(settings)})'
+
+
+class CachingDecoder:
+    """
+    Cache the results of another decoder on disk.
+
+    Results are pickled to files under `cache_dir`, keyed by a hash of the raw
+    response, the decoder (and its settings), the library version and
+    `schema_version()`, so they're never stale: a changed response, decoder or
+    schema is simply a different key. Pass `decoder` a `CompositeDecoder` (e.g.
+    `FastDataclassDecoder()` or `EventsFrameDecoder()`) that decodes raw responses.
+
+    When the cache grows beyond `max_bytes`, the least recently used results are
+    evicted. Results can be stored compressed with `compression='gzip'` or `'zstd'`.
+    Responses that aren't bytes (e.g. streamed chunks) are decoded without caching.
+
+    Cached results are unpickled from `cache_dir`, so anyone who can write to it can
+    run arbitrary code in this process: only use a directory that you alone control.
+    """
+    FILE_EXTENSION = 'pickle'
+
+    def __init__(self, decoder, cache_dir, max_bytes=None, compression=None):
+        self.decoder = decoder
+        self.max_bytes = max_bytes
+        self._cache_dir = cache_dir
+        self._compression = compression
+        self._prefix = f'{__version__}:{schema_version()}:{_decoder_key(decoder)}'.encode('utf8')
+        self._store = storage.LRUStore(
+            cache_dir, storage.compressed_path(f'.{self.FILE_EXTENSION}', compression), max_bytes, compression
+        )
+
+    @property
+    def hits(self):
+        return self._store.hits
+
+    @property
+    def misses(self):
+        return self._store.misses
+
+    def _file_path(self, route, s, variant=''):
+        key = hashlib.blake2b(digest_size=20)
+        key.update(self._prefix)
+        key.update(f':{route}:{variant}:'.encode('utf8'))
+        key.update(s.encode('utf8') if isinstance(s, str) else s)
+        digest = key.hexdigest()
+        return storage.compressed_path(
+            os.path.join(self._cache_dir, route, digest[:2], f'{digest}.{self.FILE_EXTENSION}'),
+            self._compression
+        )
+
+    def _decode(self, route, s, decode, variant=''):
+        if not isinstance(s, (bytes, bytearray, memoryview, str)):
+            return decode(s)
+        file_path = self._file_path(route, s, variant)
+        content = self._store.read(file_path)
+        if content is not None:
+            return pickle.loads(content)
+        result = decode(s)
+        self._store.write(file_path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    def cache_size(self):
+        """ Total size (in bytes) of the cached results. """
+        return self._store.size()
+
+    def decode_competitions(self, s):
+        return self._decode('competitions', s, self.decoder.decode_competitions)
+
+    def decode_matches(self, s):
+        return self._decode('matches', s, self.decoder.decode_matches)
+
+    def decode_lineups(self, s):
+        return self._decode('lineups', s, self.decoder.decode_lineups)
+
+    def decode_events(self, s):
+        return self._decode('events', s, self.decoder.decode_events)
+
+    def project_events(self, s, projection):
+        variant = repr((
+            sorted(projection.type_ids or ()), sorted(projection.type_names or ()),
+            projection.type_ids is None, sorted(projection.keys) if projection.keys is not None else None,
+        ))
+        return self._decode('events', s, lambda s: self.decoder.project_events(s, projection), variant)
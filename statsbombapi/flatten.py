@@ -0,0 +1,221 @@
+"""
+Flatten API responses into columns, following the dataclasses in `json.data`
+
+Each route's rows are flattened into one column per (nested) field, named by
+joining the field names with underscores: e.g. `type_name`, `pass_end_location_x`
+and `shot_statsbomb_xg` for events. Nested entities with an id and a name (teams,
+players, event types, outcomes and so on) are flattened into just those two
+columns; locations into `_x` and `_y` (and `_z`) columns; and any other lists
+(like `shot_freeze_frame` or `tactics_lineup`) into a column of JSON text.
+
+The events route has a row per event, and the lineups route a row per player
+(with the player's `team_id` and `team_name`).
+
+Like `json.codegen`, the flattening function for each route is generated once,
+so that rows are flattened in a single pass with no per-value dispatch.
+"""
+import dataclasses
+import datetime
+import enum
+import functools
+import json
+import typing
+import uuid
+
+from .json import convert, data
+
+
+class Column(typing.NamedTuple):
+    name: str
+    # JSON keys from the row to the value. A final int indexes into a list (for locations)
+    path: tuple
+    # One of KINDS
+    kind: str
+
+
+KINDS = ('int', 'float', 'bool', 'str', 'enum', 'uuid', 'date', 'time', 'datetime', 'json')
+
+ROUTE_CLASSES = {
+    'competitions': data.CompetitionSeason,
+    'matches': data.Match,
+    'lineups': data.LineupPlayer,
+    'events': data.Event,
+}
+
+# Locations have two dimensions, except for these
+LOCATION_DIMENSIONS = {
+    (data.Shot, 'end_location'): 3,
+}
+
+_DIMENSION_NAMES = ('x', 'y', 'z')
+_NoneType = type(None)
+
+
+def _optional_type(tp):
+    if getattr(tp, '__origin__', None) is typing.Union:
+        args = [arg for arg in tp.__args__ if arg is not _NoneType]
+        if len(args) == 1:
+            return args[0]
+    return tp
+
+
+def _is_entity(cls):
+    names = {field.name for field in dataclasses.fields(cls)}
+    return {'id', 'name'} <= names
+
+
+def _scalar_kind(tp):
+    if tp in (int, float, bool, str):
+        return tp.__name__
+    if tp is uuid.UUID:
+        return 'uuid'
+    # NB datetime is a subclass of date
+    if tp is datetime.datetime:
+        return 'datetime'
+    if tp is datetime.date:
+        return 'date'
+    if tp is datetime.time:
+        return 'time'
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return 'enum'
+    return 'json'
+
+
+def _flatten_class(cls, name_prefix, path, key_prefix=''):
+    hints = typing.get_type_hints(cls)
+    for field in dataclasses.fields(cls):
+        key = data.json_key(field)
+        name = name_prefix + (key if key.isidentifier() else field.name)
+        field_path = path + (key_prefix + key,)
+        tp = _optional_type(hints[field.name])
+        prefix = field.metadata.get('statsbombapi', {}).get('prefix', '')
+
+        if dataclasses.is_dataclass(tp):
+            if _is_entity(tp):
+                yield Column(f'{name}_id', field_path + (prefix + 'id',), 'int')
+                yield Column(f'{name}_name', field_path + (prefix + 'name',), 'str')
+            else:
+                yield from _flatten_class(tp, f'{name}_', field_path, prefix)
+        elif getattr(tp, '__origin__', None) is list:
+            if tp.__args__[0] is float:
+                dimensions = LOCATION_DIMENSIONS.get((cls, field.name), 2)
+                for i in range(dimensions):
+                    yield Column(f'{name}_{_DIMENSION_NAMES[i]}', field_path + (i,), 'float')
+            else:
+                yield Column(name, field_path, 'json')
+        elif field.metadata.get('dataclasses_json', {}).get('decoder') and tp is str:
+            # e.g. `Manager.birth_date`, which is decoded to a date despite its type
+            yield Column(name, field_path, 'date')
+        else:
+            yield Column(name, field_path, _scalar_kind(tp))
+
+
+@functools.lru_cache(maxsize=None)
+def columns(route: str) -> typing.Tuple[Column, ...]:
+    """ The columns of `route`, in order. """
+    flattened = {}
+    if route == 'lineups':
+        flattened['team_id'] = Column('team_id', ('team_id',), 'int')
+        flattened['team_name'] = Column('team_name', ('team_name',), 'str')
+    for column in _flatten_class(ROUTE_CLASSES[route], '', ()):
+        # Fields derived from others (e.g. `CompetitionSeason.competition`) would
+        # repeat the same columns
+        flattened.setdefault(column.name, column)
+    return tuple(flattened.values())
+
+
+def _tree(columns):
+    """ Nest the columns' indices by path, e.g. {'pass': {'end_location': {0: 12, 1: 13}}}. """
+    tree = {}
+    for i, column in enumerate(columns):
+        node = tree
+        for key in column.path[:-1]:
+            node = node.setdefault(key, {})
+        node[column.path[-1]] = i
+    return tree
+
+
+def _leaves(node):
+    if isinstance(node, int):
+        yield node
+    else:
+        for child in node.values():
+            yield from _leaves(child)
+
+
+def _flatten_lines(node, var, indent, depth=0):
+    pad = '    ' * indent
+    if all(isinstance(k, int) for k in node):
+        # A location: index into the list (which may be shorter than expected)
+        lines = []
+        for i, leaf in node.items():
+            lines.append(f'{pad}a{leaf}({var}[{i}] if len({var}) > {i} else None)')
+        return lines
+
+    lines = []
+    for key, child in node.items():
+        if isinstance(child, int):
+            lines.append(f'{pad}a{child}({var}.get({key!r}))')
+            continue
+        child_var = f'x{depth}'
+        lines.append(f'{pad}{child_var} = {var}.get({key!r})')
+        lines.append(f'{pad}if {child_var}:')
+        lines.extend(_flatten_lines(child, child_var, indent + 1, depth + 1))
+        lines.append(f'{pad}else:')
+        lines.extend(f'{pad}    a{leaf}(None)' for leaf in _leaves(child))
+    return lines
+
+
+@functools.lru_cache(maxsize=None)
+def _row_flattener(route):
+    """ Generate a function that flattens a list of rows into lists of (raw) values. """
+    cols = columns(route)
+    lines = ['def flatten_rows(rows):']
+    lines.extend(f'    c{i} = []; a{i} = c{i}.append' for i in range(len(cols)))
+    lines.append('    for row in rows:')
+    lines.extend(_flatten_lines(_tree(cols), 'row', 2))
+    lines.append(f'    return [{", ".join(f"c{i}" for i in range(len(cols)))}]')
+    namespace = {}
+    exec('\n'.join(lines) + '\n', namespace)
+    return namespace['flatten_rows']
+
+
+def _json_dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+# How the raw values of each kind are converted (None and '' are missing)
+_CONVERTERS = {
+    'date': convert.parse_date_cached,
+    'time': convert.parse_time,
+    'datetime': convert.parse_datetime_cached,
+    'json': _json_dumps,
+}
+
+
+def rows(route: str, response: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
+    """ The rows of a (parsed) response: the response itself, except for lineups. """
+    if route != 'lineups':
+        return response
+    return [
+        dict(player, team_id=lineup['team_id'], team_name=lineup['team_name'])
+        for lineup in response
+        for player in lineup['lineup']
+    ]
+
+
+def flatten(route: str, response: typing.List[typing.Dict[str, typing.Any]]) -> typing.Dict[str, list]:
+    """
+    Flatten a (parsed) response into lists of values, by column name.
+
+    Dates and times are parsed, JSON columns are serialised, and other values are
+    left as they are in the JSON (enums and UUIDs as strings). Missing values are None.
+    """
+    values = _row_flattener(route)(rows(route, response))
+    flattened = {}
+    for column, column_values in zip(columns(route), values):
+        convert_value = _CONVERTERS.get(column.kind)
+        if convert_value is not None:
+            column_values = [convert_value(v) if v or v == 0 else None for v in column_values]
+        flattened[column.name] = column_values
+    return flattened
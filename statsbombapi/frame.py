@@ -0,0 +1,248 @@
+"""
+Columnar events: NumPy arrays of the most used event fields (and of shots' freeze
+frames), built straight from the parsed JSON (without decoding each event into a
+dataclass)
+"""
+import typing
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Ids of missing entities (e.g. the player of a Half Start event)
+MISSING_ID = -1
+
+COLUMNS = {
+    'id': 'U36',
+    'index': 'int32',
+    'period': 'int8',
+    'timestamp': 'float64',  # seconds since the start of the period
+    'minute': 'int16',
+    'second': 'int8',
+    'type_id': 'int16',
+    'possession': 'int32',
+    'possession_team_id': 'int32',
+    'play_pattern_id': 'int16',
+    'team_id': 'int32',
+    'player_id': 'int32',
+    'position_id': 'int16',
+    'location_x': 'float64',
+    'location_y': 'float64',
+    'end_location_x': 'float64',
+    'end_location_y': 'float64',
+    'duration': 'float64',
+}
+
+# Categorical columns are stored as ids (`<category>_id`), with a dictionary of
+# the name of each id
+CATEGORIES = ('type', 'possession_team', 'play_pattern', 'team', 'player', 'position')
+
+# The event metadata that may have an end location, in order of precedence
+END_LOCATION_KEYS = ('pass', 'carry', 'shot', 'goalkeeper')
+
+# The features of each player in a freeze frame, in order
+FREEZE_FRAME_FEATURES = ('x', 'y', 'teammate', 'position_id')
+
+_SHOT_TYPE_ID = 16
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('EventsFrame requires the `numpy` package (`pip install numpy`)')
+
+
+class EventsFrame:
+    """
+    A match's (or several matches') events as a struct of NumPy arrays.
+
+    Columns (see `COLUMNS`) are available as items or attributes, e.g.
+    `frame['location_x']` or `frame.location_x`. Missing locations and durations
+    are NaN, and missing ids are `MISSING_ID`.
+
+    The categorical columns (see `CATEGORIES`) hold ids, and `categories` maps each
+    to a dictionary of names, e.g. `frame.categories['type'][16] == 'Shot'`.
+    """
+    def __init__(self, columns: typing.Dict[str, typing.Any], categories: typing.Dict[str, typing.Dict[int, str]]):
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.columns['index'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __getattr__(self, name):
+        # NOTE: guard against recursion before `columns` is set (e.g. when unpickling)
+        if name != 'columns' and name in self.columns:
+            return self.columns[name]
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return f'EventsFrame({len(self)} events)'
+
+    def names(self, category: str):
+        """ The name of the `category` (e.g. 'player') of each event, or None if missing. """
+        lookup = self.categories[category]
+        return np.array([lookup.get(i) for i in self.columns[f'{category}_id'].tolist()], dtype=object)
+
+    def select(self, mask) -> 'EventsFrame':
+        """ The events selected by a boolean mask (or array of indices). """
+        return EventsFrame({name: column[mask] for name, column in self.columns.items()}, self.categories)
+
+    @classmethod
+    def concat(cls, frames: typing.Sequence['EventsFrame'],
+               match_ids: typing.Optional[typing.Sequence[int]] = None) -> 'EventsFrame':
+        """
+        Join several frames (e.g. of different matches) into one.
+
+        If `match_ids` (one per frame) are given, they're added as a `match_id`
+        column. An existing `match_id` column is kept if every frame has one.
+        """
+        _require_numpy()
+        categories = {category: {} for category in CATEGORIES}
+        for frame in frames:
+            for category, lookup in frame.categories.items():
+                categories[category].update(lookup)
+        columns = {
+            name: np.concatenate([frame.columns[name] for frame in frames]) if frames else np.empty(0, dtype)
+            for name, dtype in COLUMNS.items()
+        }
+        if match_ids is not None:
+            lengths = [len(frame) for frame in frames]
+            columns['match_id'] = np.repeat(np.array(match_ids, dtype='int64'), lengths)
+        elif frames and all('match_id' in frame.columns for frame in frames):
+            columns['match_id'] = np.concatenate([frame.columns['match_id'] for frame in frames])
+        return cls(columns, categories)
+
+
+def _seconds(timestamp):
+    # e.g. 00:04:12.318
+    return int(timestamp[:2]) * 3600 + int(timestamp[3:5]) * 60 + float(timestamp[6:])
+
+
+def events_frame(response: typing.List[typing.Dict[str, typing.Any]]) -> EventsFrame:
+    """ Build an `EventsFrame` from a (parsed) events response. """
+    _require_numpy()
+    nan = float('nan')
+    values = {name: [] for name in COLUMNS}
+    categories = {category: {} for category in CATEGORIES}
+    appends = {name: column.append for name, column in values.items()}
+    category_appends = [(c, appends[f'{c}_id'], categories[c]) for c in CATEGORIES]
+
+    for event in response:
+        for name in ('id', 'index', 'period', 'minute', 'second', 'possession'):
+            appends[name](event[name])
+        appends['timestamp'](_seconds(event['timestamp']))
+        duration = event.get('duration')
+        appends['duration'](nan if duration is None else duration)
+
+        for category, append_id, lookup in category_appends:
+            entity = event.get(category)
+            if entity is None:
+                append_id(MISSING_ID)
+            else:
+                entity_id = entity['id']
+                append_id(entity_id)
+                if entity_id not in lookup:
+                    lookup[entity_id] = entity['name']
+
+        location = event.get('location')
+        if location:
+            appends['location_x'](location[0])
+            appends['location_y'](location[1])
+        else:
+            appends['location_x'](nan)
+            appends['location_y'](nan)
+
+        end_location = None
+        for key in END_LOCATION_KEYS:
+            metadata = event.get(key)
+            if metadata is not None and metadata.get('end_location'):
+                end_location = metadata['end_location']
+                break
+        if end_location:
+            appends['end_location_x'](end_location[0])
+            appends['end_location_y'](end_location[1])
+        else:
+            appends['end_location_x'](nan)
+            appends['end_location_y'](nan)
+
+    columns = {name: np.array(values[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+    return EventsFrame(columns, categories)
+
+
+class FreezeFrames:
+    """
+    The freeze frames of a set of shots, padded to the same number of players.
+
+    `features` has shape (shots, players, len(FREEZE_FRAME_FEATURES)), and holds
+    each player's location, whether they're a teammate of the shooter (1 or 0) and
+    their position id (or `MISSING_ID`). `mask` (shots, players) is True for the
+    players that are present, and `player_id` (shots, players) holds their ids.
+    Padding is zero (or `MISSING_ID` for player ids).
+    """
+    def __init__(self, shot_id, features, mask, player_id):
+        self.shot_id = shot_id
+        self.features = features
+        self.mask = mask
+        self.player_id = player_id
+
+    def __len__(self):
+        return len(self.shot_id)
+
+    def __repr__(self):
+        return f'FreezeFrames({len(self)} shots, {self.mask.shape[1]} players)'
+
+
+def freeze_frames(responses: typing.Iterable[typing.List[typing.Dict[str, typing.Any]]],
+                  max_players: typing.Optional[int] = None) -> FreezeFrames:
+    """
+    Extract the freeze frames of the shots in (parsed) events responses, e.g. a
+    season's matches.
+
+    Shots are padded to the largest freeze frame, or truncated to `max_players`.
+    Shots without a freeze frame (e.g. penalties in older data) have no players.
+    """
+    _require_numpy()
+    shot_ids = []
+    counts = []
+    values = []
+    player_ids = []
+    for response in responses:
+        for event in response:
+            if event['type']['id'] != _SHOT_TYPE_ID:
+                continue
+            players = (event.get('shot') or {}).get('freeze_frame') or ()
+            if max_players is not None:
+                players = players[:max_players]
+            shot_ids.append(event['id'])
+            counts.append(len(players))
+            for player in players:
+                location = player['location']
+                position = player.get('position')
+                values.append((
+                    location[0],
+                    location[1],
+                    player['teammate'],
+                    MISSING_ID if position is None else position['id'],
+                ))
+                player_ids.append(player['player']['id'])
+
+    # Scatter the players (in one flat array) into their shot's row
+    counts = np.array(counts, dtype='int64')
+    n_players = int(counts.max()) if len(counts) else 0
+    if max_players is not None:
+        n_players = max_players
+    rows = np.repeat(np.arange(len(counts)), counts)
+    columns = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    features = np.zeros((len(counts), n_players, len(FREEZE_FRAME_FEATURES)), dtype='float32')
+    features[rows, columns] = np.array(values, dtype='float32').reshape(-1, len(FREEZE_FRAME_FEATURES))
+    mask = np.zeros((len(counts), n_players), dtype=bool)
+    mask[rows, columns] = True
+    player_id = np.full((len(counts), n_players), MISSING_ID, dtype='int32')
+    player_id[rows, columns] = player_ids
+    return FreezeFrames(np.array(shot_ids, dtype='U36'), features, mask, player_id)
@@ -50,7 +50,12 @@ from .data import (
 from .parse import(
     parse_competitions,
     parse_events,
+    parse_events_iter,
     parse_lineups,
     parse_matches,
-    extract
+    extract,
+    warmup
 )
+from .stream import iter_array
+from .lazy import LazyEvent
+from .intern import InternPool
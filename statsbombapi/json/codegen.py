@@ -0,0 +1,264 @@
+"""
+Generate specialised functions that decode parsed JSON into the dataclasses in `data`
+
+`dataclasses_json` works out how to decode each field (and marshmallow builds and
+runs a schema) for every object it decodes. Here that work is done once per
+dataclass: `decoder(cls)` writes out the source of a function that builds a `cls`
+from a dict, field by field, and compiles it.
+
+The decoded dataclasses are equal to those from `from_dict`/`schema().load`, with
+two differences for malformed input: keys that aren't fields are always ignored,
+and values aren't validated beyond what their conversion requires.
+"""
+import dataclasses
+import enum
+import functools
+import threading
+import typing
+import uuid
+
+from . import convert, data, slotted
+
+
+_NoneType = type(None)
+
+
+def _optional_type(tp):
+    """ `X` if `tp` is `Optional[X]`, otherwise None. """
+    if getattr(tp, '__origin__', None) is typing.Union:
+        args = [arg for arg in tp.__args__ if arg is not _NoneType]
+        if len(args) == 1 and len(tp.__args__) == 2:
+            return args[0]
+    return None
+
+
+def _list_type(tp):
+    """ `X` if `tp` is `List[X]`, otherwise None. """
+    if getattr(tp, '__origin__', None) is list:
+        return tp.__args__[0]
+    return None
+
+
+def _is_hashable_type(tp):
+    tp = _optional_type(tp) or tp
+    if _list_type(tp) is not None:
+        return False
+    if dataclasses.is_dataclass(tp):
+        return _is_internable(tp)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _is_internable(cls):
+    """ Whether `cls` is frozen, and so are all of its fields' values (recursively). """
+    if not cls.__dataclass_params__.frozen:
+        return False
+    hints = typing.get_type_hints(cls)
+    return all(
+        field.init and _is_hashable_type(hints[field.name])
+        for field in dataclasses.fields(cls)
+    )
+
+
+class _Module:
+    """
+    The namespace shared by the generated functions.
+
+    The functions construct `variant(cls)` for each dataclass `cls`, e.g. its
+    `slotted` variant.
+    """
+    def __init__(self, variant=None):
+        self.variant = variant or (lambda cls: cls)
+        self.namespace = {
+            '_MISSING': dataclasses.MISSING,
+            '_remove_prefix': data.remove_prefix,
+        }
+        self.functions = {}
+
+    def add(self, name, value):
+        """ Make `value` available to the generated code, as (a variant of) `name`. """
+        for existing, v in self.namespace.items():
+            if v is value:
+                return existing
+        unique = self._unique(name)
+        self.namespace[unique] = value
+        return unique
+
+    def _unique(self, name):
+        unique, i = name, 0
+        while unique in self.namespace or unique in self.functions.values():
+            i += 1
+            unique = f'{name}_{i}'
+        return unique
+
+    def decoder(self, cls):
+        """ The name of the function that decodes `cls`, generating it if need be. """
+        if cls not in self.functions:
+            # Register the name first, so that (mutually) recursive types resolve
+            self.functions[cls] = name = self._unique(f'decode_{cls.__name__}')
+            exec(self._source(cls, name), self.namespace)
+        return self.functions[cls]
+
+    def convert(self, tp, var, depth=0):
+        """
+        An expression that converts the JSON value `var` into a `tp`, or None if the
+        value is used as it is.
+        """
+        optional = _optional_type(tp)
+        if optional is not None:
+            expr = self.convert(optional, var, depth)
+            return None if expr is None else f'None if {var} is None else {expr}'
+
+        item_type = _list_type(tp)
+        if item_type is not None:
+            item = f'_x{depth}'
+            expr = self.convert(item_type, item, depth + 1)
+            return f'list({var})' if expr is None else f'[{expr} for {item} in {var}]'
+
+        if dataclasses.is_dataclass(tp):
+            return f'{self.decoder(tp)}({var}, intern)'
+        if tp is uuid.UUID:
+            return f'{self.add("parse_uuid", convert.parse_uuid)}({var})'
+        if isinstance(tp, type) and issubclass(tp, enum.Enum):
+            return f'{self.add(tp.__name__, tp)}({var})'
+        if tp is float:
+            return f'float({var})'
+        return None
+
+    def _field_expr(self, cls, field, tp, var):
+        lib_metadata = field.metadata.get('dataclasses_json', {})
+        prefix = field.metadata.get('statsbombapi', {}).get('prefix')
+        if prefix is not None:
+            return f'{self.decoder(tp)}(_remove_prefix({var}, {prefix!r}), intern)'
+        if 'decoder' in lib_metadata:
+            decode = self.add(f'_decode_{cls.__name__}_{field.name}', lib_metadata['decoder'])
+            return f'{decode}({var})'
+        return self.convert(_optional_type(tp) or tp, var)
+
+    def _field_lines(self, cls, field, tp, value):
+        """ Lines that decode `field` from the dict `d` into the variable `value`. """
+        key = data.json_key(field)
+        expr = self._field_expr(cls, field, tp, 'x')
+
+        if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING:
+            get = f'd[{key!r}]'
+        elif field.default is None:
+            # A missing key and null are both the default
+            get = f'_get({key!r})'
+        else:
+            if field.default is not dataclasses.MISSING:
+                default = self.add(f'_default_{cls.__name__}_{field.name}', field.default)
+            else:
+                factory = self.add(f'_factory_{cls.__name__}_{field.name}', field.default_factory)
+                default = f'{factory}()'
+            lines = [
+                f'    x = _get({key!r}, _MISSING)',
+                '    if x is _MISSING:',
+                f'        x = {default}',
+            ]
+            if expr is not None:
+                lines.append('    elif x is not None:')
+                lines.append(f'        x = {expr}')
+            return lines + [f'    {value} = x']
+
+        if expr is None:
+            return [f'    {value} = {get}']
+        return [f'    x = {get}', f'    {value} = None if x is None else {expr}']
+
+    def _source(self, cls, name):
+        hints = typing.get_type_hints(cls)
+        lines = [f'def {name}(d, intern=None):', '    _get = d.get']
+        names = []
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+            lines.extend(self._field_lines(cls, field, hints[field.name], f'f_{field.name}'))
+            names.append(field.name)
+
+        cls_name = self.add(cls.__name__, self.variant(cls))
+        if _is_internable(cls):
+            # Look up an existing instance by its field values, before constructing one
+            values = ''.join(f'f_{name}, ' for name in names)
+            lines.append('    if intern is not None:')
+            lines.append(f'        return intern({cls_name}, ({values.rstrip()}))')
+        kwargs = ', '.join(f'{name}=f_{name}' for name in names)
+        lines.append(f'    return {cls_name}({kwargs})')
+        return '\n'.join(lines) + '\n'
+
+    def field_decoder(self, cls, field_name):
+        """ Generate a function that decodes only the field `field_name` of `cls`. """
+        field = next(f for f in dataclasses.fields(cls) if f.name == field_name)
+        name = self._unique(f'decode_{cls.__name__}_{field_name}')
+        lines = [f'def {name}(d, intern=None):', '    _get = d.get']
+        lines.extend(self._field_lines(cls, field, typing.get_type_hints(cls)[field_name], 'value'))
+        lines.append('    return value')
+        exec('\n'.join(lines) + '\n', self.namespace)
+        return self.namespace[name]
+
+
+_module = _Module()
+_slotted_module = _Module(slotted.variant)
+# Generating a function registers its name before defining it (see `_Module.decoder`),
+# so other threads must wait until it's defined
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def decoder(cls, slots=False) -> typing.Callable[..., typing.Any]:
+    """
+    A function that decodes a dict of parsed JSON into the dataclass `cls`, or its
+    `slotted` variant if `slots` is true.
+
+    The function takes the dict and, optionally, an `intern.InternPool`.
+    """
+    module = _slotted_module if slots else _module
+    with _lock:
+        return module.namespace[module.decoder(cls)]
+
+
+@functools.lru_cache(maxsize=None)
+def field_decoder(cls, field_name) -> typing.Callable[..., typing.Any]:
+    """
+    A function that decodes the field `field_name` of the dataclass `cls` from a
+    dict of parsed JSON (the whole object, not just the field's value).
+    """
+    with _lock:
+        return _module.field_decoder(cls, field_name)
+
+
+def source(cls, slots=False) -> str:
+    """ The generated source of the function that decodes `cls`, for debugging. """
+    module = _slotted_module if slots else _module
+    with _lock:
+        return module._source(cls, module.decoder(cls))
+
+
+# Parse routes
+#
+# With an `intern.InternPool` as `intern`, repeated values of the pool's types
+# are decoded to the same (canonical) instance. With `slots=True`, the routes
+# return `slotted` variants of the dataclasses.
+
+def parse_competitions(response: typing.List[typing.Dict[str, typing.Any]],
+                       intern=None, slots=False) -> typing.List[data.CompetitionSeason]:
+    decode = decoder(data.CompetitionSeason, slots)
+    return [decode(r, intern) for r in response]
+
+
+def parse_matches(response: typing.List[typing.Dict[str, typing.Any]],
+                  intern=None, slots=False) -> typing.List[data.Match]:
+    decode = decoder(data.Match, slots)
+    return [decode(d, intern) for d in response]
+
+
+def parse_lineups(response: typing.List[typing.Dict[str, typing.Any]],
+                  intern=None, slots=False) -> typing.List[data.Lineup]:
+    l1, l2 = response
+    decode = decoder(data.Lineup, slots)
+    return [decode(l1, intern), decode(l2, intern)]
+
+
+def parse_events(response: typing.List[typing.Dict[str, typing.Any]],
+                 intern=None, slots=False) -> typing.List[data.Event]:
+    decode = decoder(data.Event, slots)
+    return [decode(d, intern) for d in response]
@@ -0,0 +1,77 @@
+"""
+Fast parsers for the date, time, datetime and UUID fields of the API responses
+
+Each handles the fixed format that the API uses with a fast path, and falls back
+to the general (slow) parser for anything else, so the results (and errors) are
+the same as `strptime`/`uuid.UUID` would give.
+"""
+import datetime
+import functools
+import uuid
+
+
+_date_fromisoformat = datetime.date.fromisoformat
+_time_fromisoformat = datetime.time.fromisoformat
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+_UUID = uuid.UUID
+_SAFE_UUID_UNKNOWN = uuid.SafeUUID.unknown
+
+
+def _is_ascii_digits(s):
+    return s.isascii() and s.isdigit()
+
+
+def parse_date(s: str) -> datetime.date:
+    """ Equivalent to `datetime.datetime.strptime(s, '%Y-%m-%d').date()`. """
+    # e.g. 2020-01-30
+    if len(s) == 10 and s[4] == '-' and s[7] == '-' and _is_ascii_digits(s[:4] + s[5:7] + s[8:]):
+        try:
+            return _date_fromisoformat(s)
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(s, '%Y-%m-%d').date()
+
+
+def parse_time(s: str) -> datetime.time:
+    """ Equivalent to `datetime.datetime.strptime(s, '%H:%M:%S.%f').time()`. """
+    # e.g. 00:04:12.318
+    if (len(s) == 12 and s[2] == ':' and s[5] == ':' and s[8] == '.'
+            and _is_ascii_digits(s[:2] + s[3:5] + s[6:8] + s[9:])):
+        try:
+            return _time_fromisoformat(s)
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(s, '%H:%M:%S.%f').time()
+
+
+def parse_datetime(s) -> datetime.datetime:
+    """ Equivalent to `datetime.datetime.fromisoformat(str(s))`. """
+    return datetime.datetime.fromisoformat(str(s))
+
+
+def parse_uuid(s: str) -> uuid.UUID:
+    """ Equivalent to `uuid.UUID(s)`. """
+    # e.g. e1b5fbd3-2bdf-4a4a-9ad3-6b1c1e0a5d8c
+    if len(s) == 36 and s[8] == '-' and s[13] == '-' and s[18] == '-' and s[23] == '-':
+        hex_digits = s.replace('-', '')
+        if len(hex_digits) == 32:
+            try:
+                value = int(hex_digits, 16)
+            except ValueError:
+                pass
+            else:
+                # NOTE: UUIDs are immutable, so set the attributes as UUID.__init__ does
+                u = _new_object(_UUID)
+                _set_attribute(u, 'int', value)
+                _set_attribute(u, 'is_safe', _SAFE_UUID_UNKNOWN)
+                return u
+    return _UUID(s)
+
+
+# Dates (e.g. birth and match dates), kick-off times and last-updated times recur
+# across responses, so are worth caching. Event timestamps and ids mostly don't.
+
+parse_date_cached = functools.lru_cache(maxsize=2**12)(parse_date)
+parse_time_cached = functools.lru_cache(maxsize=2**10)(parse_time)
+parse_datetime_cached = functools.lru_cache(maxsize=2**12)(parse_datetime)
@@ -7,6 +7,8 @@ import uuid
 
 import dataclasses_json
 
+from . import convert
+
 
 def add_prefix(d: typing.Dict[str, typing.Any], prefix: str) -> typing.Dict[str, typing.Any]:
     """ Add a prefix to the keys of a dict. """
@@ -24,9 +26,17 @@ def remove_prefix(d: typing.Dict[str, typing.Any], prefix: str) -> typing.Dict[s
     return {_strip_prefix(k, prefix): v for k, v in d.items()}
 
 
+def json_key(field: dataclasses.Field) -> str:
+    """ The key of a dataclass field in the JSON (e.g. 'pass' for `Event.pass_`). """
+    letter_case = field.metadata.get('dataclasses_json', {}).get('letter_case')
+    return letter_case(field.name) if letter_case else field.name
+
+
 def with_prefix(x, prefix):
     """ Add a prefix to a dataclass_json's encoder/decoder """
     return dataclasses.field(metadata=dataclasses_json.config(
+        # Also record the prefix itself, for `codegen`
+        {'statsbombapi': {'prefix': prefix}},
         encoder=lambda d: add_prefix(d, prefix),
         decoder=lambda d: x.from_dict(remove_prefix(d, prefix))
     ))
@@ -37,7 +47,7 @@ def date_field(default=dataclasses.MISSING, **kwargs):
         default=default,
         metadata=dataclasses_json.config(
             encoder=str,
-            decoder=lambda x: datetime.datetime.strptime(x, '%Y-%m-%d').date() if x else None,
+            decoder=lambda x: convert.parse_date_cached(x) if x else None,
             mm_field=marshmallow.fields.Date(),
             **kwargs
         )
@@ -49,19 +59,20 @@ def iso_datetime_field(default=dataclasses.MISSING, **kwargs):
         default=default,
         metadata=dataclasses_json.config(
             encoder=datetime.datetime.isoformat,
-            decoder=lambda x: datetime.datetime.fromisoformat(str(x)) if x else None,
+            decoder=lambda x: convert.parse_datetime_cached(x) if x else None,
             mm_field=marshmallow.fields.DateTime(format='iso'),
             **kwargs
         )
     )
 
 
-def time_field(default=dataclasses.MISSING, **kwargs):
+def time_field(default=dataclasses.MISSING, cached=False, **kwargs):
+    # Only cache times that recur (like kick-off times), not (e.g.) event timestamps
     return dataclasses.field(
         default=default,
         metadata=dataclasses_json.config(
             encoder=str,
-            decoder=lambda x: datetime.datetime.strptime(x, '%H:%M:%S.%f').time(),
+            decoder=convert.parse_time_cached if cached else convert.parse_time,
             mm_field=marshmallow.fields.Time(),
             **kwargs
         )
@@ -189,7 +200,7 @@ class Match:
     competition: Competition = with_prefix(Competition, 'competition_')
     season: Season = with_prefix(Season, 'season_')
     date: datetime.date = date_field(field_name='match_date')
-    kick_off: datetime.time = time_field()
+    kick_off: datetime.time = time_field(cached=True)
     match_week: int
     metadata: MatchMetadata
     home_team: Team = with_prefix(Team, 'home_team_')
@@ -307,7 +318,8 @@ class Tactics:
 # Event qualifiers
 
 class EventMetadata:
-    pass
+    # Allow the subclasses' `slotted` variants to do without a __dict__
+    __slots__ = ()
 
 
 @dataclasses_json.dataclass_json
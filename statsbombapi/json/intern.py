@@ -0,0 +1,108 @@
+"""
+Share one instance between equal values of frozen dataclasses
+"""
+import dataclasses
+import sys
+import threading
+
+from . import data, slotted
+
+
+# The entities that recur most often within (and across) matches
+DEFAULT_TYPES = (
+    data.Country,
+    data.Team,
+    data.Player,
+    data.Position,
+    data.EventType,
+    data.PlayPattern,
+    data.StatsBombObject,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class InternStats:
+    hits: int
+    misses: int
+    bytes_saved: int
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _instance_size(obj):
+    """ The (shallow) size of an instance and its attribute dict. """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+class InternPool:
+    """
+    Canonical instances of frozen dataclasses, keyed by their field values.
+
+    Pass a pool to the decoders in `codegen` (or to `decoders.FastDataclassDecoder`)
+    so that each distinct value of the pool's `types` is only built once. Because
+    the instances are frozen, sharing them is safe.
+
+    A pool can be used for a single response, or shared between responses (e.g. a
+    season's matches). `bytes_saved` estimates the memory that would otherwise be
+    taken by duplicate instances (not counting their fields' values).
+    """
+    def __init__(self, types=DEFAULT_TYPES):
+        # Including their slotted variants
+        self.types = frozenset(types) | frozenset(map(slotted.variant, types))
+        self._instances = {}
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def __call__(self, cls, values):
+        """ The canonical `cls(*values)`. """
+        if cls not in self.types:
+            return cls(*values)
+        key = (cls, values)
+        obj = self._instances.get(key)
+        if obj is not None:
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += self._sizes[cls]
+            return obj
+        candidate = cls(*values)
+        size = _instance_size(candidate)
+        with self._lock:
+            obj = self._instances.setdefault(key, candidate)
+            if obj is candidate:
+                self._sizes.setdefault(cls, size)
+                self.misses += 1
+            else:
+                # Another thread added an equal instance first
+                self.hits += 1
+                self.bytes_saved += self._sizes[cls]
+        return obj
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def stats(self) -> InternStats:
+        return InternStats(hits=self.hits, misses=self.misses, bytes_saved=self.bytes_saved)
+
+    def clear(self):
+        """ Forget all instances (and reset the stats). """
+        with self._lock:
+            self._instances.clear()
+            self.hits = self.misses = self.bytes_saved = 0
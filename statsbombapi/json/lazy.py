@@ -0,0 +1,61 @@
+"""
+Events that decode each field from the parsed JSON the first time it's accessed
+"""
+import dataclasses
+import typing
+
+from . import codegen, data
+
+
+class _LazyField:
+    """
+    Decode a field on first access, then store it on the instance.
+
+    As a non-data descriptor, the stored value shadows this descriptor, so later
+    accesses are plain attribute lookups.
+    """
+    def __init__(self, cls, name):
+        self.name = name
+        self.decode = codegen.field_decoder(cls, name)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.decode(obj._raw)
+        obj.__dict__[self.name] = value
+        return value
+
+
+class LazyEvent(data.Event):
+    """
+    A `data.Event` that keeps the parsed JSON and decodes its fields (including the
+    nested event metadata, like `pass_` and `shot`) as they are accessed.
+
+    Lazy events compare equal to the `data.Event` with the same field values. As
+    fields are only decoded when accessed, so are errors (e.g. a missing `id`
+    raises `KeyError` when `id` is first accessed).
+    """
+    def __init__(self, raw: typing.Dict[str, typing.Any]):
+        # NOTE: bypass the (frozen) dataclass __init__
+        self.__dict__['_raw'] = raw
+
+    def __eq__(self, other):
+        if not isinstance(other, data.Event):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in dataclasses.fields(data.Event)
+        )
+
+    __hash__ = data.Event.__hash__
+
+    def __reduce__(self):
+        return (LazyEvent, (self._raw,))
+
+
+for _field in dataclasses.fields(data.Event):
+    setattr(LazyEvent, _field.name, _LazyField(data.Event, _field.name))
+
+
+def parse_events(response: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[LazyEvent]:
+    return [LazyEvent(d) for d in response]
@@ -1,12 +1,26 @@
 import collections.abc
 import dataclasses
+import functools
 import typing
 
-from . import data
+import marshmallow
+
+from . import codegen, data, slotted
+from .stream import iter_array
 
 
 # Parse routes
 
+@functools.lru_cache(maxsize=None)
+def schema(cls):
+    """
+    The (marshmallow) schema for the dataclass `cls`.
+
+    Building a schema is expensive, so each is built once per process and reused.
+    """
+    return cls.schema()
+
+
 def parse_competitions(response: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[data.CompetitionSeason]:
     # Use `from_dict` + list comprehension to workaround bug in .schema():
     # `https://github.com/lidatong/dataclasses-json/issues/266`
@@ -23,7 +37,45 @@ def parse_lineups(response: typing.List[typing.Dict[str, typing.Any]]) -> typing
 
 
 def parse_events(response: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[data.Event]:
-    return data.Event.schema().load(response, many=True)
+    return schema(data.Event).load(response, many=True)
+
+
+def parse_events_iter(stream) -> typing.Iterator[data.Event]:
+    """
+    Decode events one by one, as the response is read.
+
+    `stream` may be anything `iter_array` accepts, e.g. the chunks returned by a
+    loader created with `stream=True`.
+    """
+    event_schema = schema(data.Event)
+    for event in iter_array(stream):
+        yield event_schema.load(event)
+
+
+def warmup():
+    """
+    Do the one-off setup of decoding ahead of time.
+
+    That is, build the (marshmallow) schemas used by `parse_events` and
+    `parse_events_iter`, and generate the `codegen` decoders of every route (and
+    their slotted variants). `parse_competitions`, `parse_matches` and
+    `parse_lineups` use `from_dict`, which has no setup to do.
+
+    Call this before a worker starts taking traffic, so that the first responses
+    it decodes aren't slowed down.
+    """
+    _build_nested(schema(data.Event))
+    for cls in (data.CompetitionSeason, data.Match, data.Lineup, data.Event):
+        for slots in (False, True):
+            codegen.decoder(cls, slots)
+
+
+def _build_nested(s):
+    # Nested schemas are otherwise only built the first time they're used
+    for field in s.fields.values():
+        field = getattr(field, 'inner', field)
+        if isinstance(field, marshmallow.fields.Nested):
+            _build_nested(field.schema)
 
 
 # Extracting objects from parsed json
@@ -33,8 +85,18 @@ def extract(target, obj):
     Recursively extract any objects within `obj` that are instances of `target`.
 
     If `obj` is a dataclass, extract will search each field's values for instances
-    of `target`.
+    of `target`. Instances of `target`'s `slotted` variant are extracted too.
     """
+    return _extract(_with_variant(target), obj)
+
+
+def _with_variant(target):
+    if isinstance(target, tuple):
+        return tuple(t for cls in target for t in _with_variant(cls))
+    return (target, slotted.variant(target))
+
+
+def _extract(target, obj):
     if isinstance(obj, target):
         yield obj
     elif isinstance(obj, collections.abc.Iterable):
@@ -48,10 +110,10 @@ def _extract_from_iter(target, obj):
         # Prevent infinite recursion in strings
         if o == obj:
             continue
-        yield from extract(target, o)
+        yield from _extract(target, o)
 
 
 def _extract_from_dataclass(target, obj):
     for field in dataclasses.fields(obj):
         field_value = getattr(obj, field.name)
-        yield from extract(target, field_value)
+        yield from _extract(target, field_value)
@@ -0,0 +1,66 @@
+"""
+Select events (and their fields) from parsed JSON, before decoding them further
+"""
+import dataclasses
+import numbers
+import typing
+
+from . import data
+
+
+# The keys of each `data.Event` field, by field name (e.g. 'pass_' -> 'pass')
+EVENT_KEYS = {field.name: data.json_key(field) for field in dataclasses.fields(data.Event)}
+
+# The keys that `data.Event` can't be decoded without
+REQUIRED_KEYS = frozenset(
+    data.json_key(field) for field in dataclasses.fields(data.Event)
+    if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+)
+
+
+class EventProjection:
+    """
+    Keep only the events of the given `types`, with only the given `fields`.
+
+    `types` may contain event type ids (e.g. `16`) and names (e.g. `'Shot'`), or be
+    a single id or name.
+    `fields` may be given by key (e.g. `'pass'`) or `data.Event` field name
+    (e.g. `'pass_'`). The keys needed to decode a `data.Event` are always kept.
+    Either can be None, to keep all types or fields.
+    """
+    def __init__(self, types: typing.Optional[typing.Iterable[typing.Union[int, str]]] = None,
+                 fields: typing.Optional[typing.Iterable[str]] = None):
+        if types is None:
+            self.type_ids = self.type_names = None
+        else:
+            if isinstance(types, (str, numbers.Integral)):
+                types = [types]
+            types = list(types)
+            for t in types:
+                if not isinstance(t, (str, numbers.Integral)):
+                    raise ValueError(f'Event types must be ids or names, not {t!r}')
+            # Including NumPy integers, e.g. from `frame.EventsFrame.type_id`
+            self.type_ids = frozenset(int(t) for t in types if isinstance(t, numbers.Integral))
+            self.type_names = frozenset(t for t in types if isinstance(t, str))
+        if fields is None:
+            self.keys = None
+        else:
+            self.keys = REQUIRED_KEYS | {EVENT_KEYS.get(f, f) for f in fields}
+
+    def keep(self, event: typing.Dict[str, typing.Any]) -> bool:
+        """ Whether `event` is of one of the selected types. """
+        if self.type_ids is None:
+            return True
+        event_type = event['type']
+        return event_type['id'] in self.type_ids or event_type['name'] in self.type_names
+
+    def project(self, event: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """ `event` with only the selected fields. """
+        if self.keys is None:
+            return event
+        keys = self.keys
+        return {k: v for k, v in event.items() if k in keys}
+
+    def __call__(self, events: typing.Iterable[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
+        keep, project = self.keep, self.project
+        return [project(event) for event in events if keep(event)]
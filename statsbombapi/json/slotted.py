@@ -0,0 +1,70 @@
+"""
+Variants of the dataclasses in `data` that use `__slots__` instead of a `__dict__`
+
+Each variant has the same name, fields, methods and (frozen) semantics as its
+original, but without a per-instance `__dict__` it takes around half the memory.
+The variants are built as `dataclass(slots=True)` does (which needs Python 3.10+).
+
+`__post_init__` derivations build slotted variants too, and `parse.extract` finds
+variants when given the original class as the target. Slotted instances don't
+compare equal to the originals, though: use `variant` to map between the classes.
+"""
+import dataclasses
+import types
+
+from . import data
+
+
+_VARIANTS = {}
+# The globals seen by copied methods (e.g. `__post_init__`), so that the variants
+# refer to each other rather than to the originals
+_GLOBALS = dict(vars(data))
+
+
+def _getstate(self):
+    return [getattr(self, f.name) for f in dataclasses.fields(self)]
+
+
+def _setstate(self, state):
+    for field, value in zip(dataclasses.fields(self), state):
+        # Use object.__setattr__ since the dataclasses are frozen
+        object.__setattr__(self, field.name, value)
+
+
+def _with_slots(cls):
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+
+    if '__post_init__' in cls_dict:
+        post_init = cls_dict['__post_init__']
+        cls_dict['__post_init__'] = types.FunctionType(
+            post_init.__code__, _GLOBALS, post_init.__name__, post_init.__defaults__, post_init.__closure__
+        )
+    cls_dict['__getstate__'] = _getstate
+    cls_dict['__setstate__'] = _setstate
+    cls_dict['__module__'] = __name__
+
+    bases = tuple(_VARIANTS.get(base, base) for base in cls.__bases__)
+    variant = type(cls)(cls.__name__, bases, cls_dict)
+    variant.__qualname__ = cls.__qualname__
+    return variant
+
+
+for _name, _cls in list(vars(data).items()):
+    if isinstance(_cls, type) and dataclasses.is_dataclass(_cls) and _cls.__module__ == data.__name__:
+        _VARIANTS[_cls] = _GLOBALS[_name] = globals()[_name] = _with_slots(_cls)
+
+
+def variant(cls):
+    """ The slotted variant of the dataclass `cls` from `data` (or `cls`, if it has none). """
+    return _VARIANTS.get(cls, cls)
+
+
+def original(cls):
+    """ The dataclass in `data` that `cls` is the slotted variant of (or `cls` itself). """
+    return next((c for c, v in _VARIANTS.items() if v is cls), cls)
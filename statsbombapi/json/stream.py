@@ -0,0 +1,120 @@
+"""
+Incrementally decode JSON arrays from a stream of bytes
+"""
+import codecs
+import json
+
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER = '0123456789+-.eE'
+
+
+def _iter_chunks(source, chunk_size):
+    if isinstance(source, str):
+        yield source
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        # Decode buffers a chunk at a time too, so that (e.g.) a memory-mapped
+        # file isn't decoded to text all at once
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+class _Reader:
+    def __init__(self, source, chunk_size):
+        self._chunks = _iter_chunks(source, chunk_size)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """ Read the next chunk into the buffer. Returns False at the end of the stream. """
+        if self.eof:
+            return False
+        # Drop what has already been consumed, so the buffer stays around one chunk long
+        if self.pos:
+            self.buffer, self.pos = self.buffer[self.pos:], 0
+        for chunk in self._chunks:
+            if isinstance(chunk, str):
+                self.buffer += chunk
+            else:
+                self.buffer += self._text.decode(chunk)
+            return True
+        self.buffer += self._text.decode(b'', final=True)
+        self.eof = True
+        return True
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """ The next non-whitespace character, or '' at the end of the stream. """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self._error(f'Expecting {char!r}')
+        self.pos += 1
+
+    def _may_continue(self, value, end):
+        """
+        Whether a decoded value may continue in the next chunk: a number followed only
+        by (the start of) more of a number, e.g. `1.` of `1.5`, or `1.5e` of `1.5e3`.
+        """
+        if type(value) not in (int, float):
+            return end == len(self.buffer)
+        while end < len(self.buffer) and self.buffer[end] in _NUMBER:
+            end += 1
+        return end == len(self.buffer)
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+                if self.eof or not self._may_continue(value, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_array(source, chunk_size=2**16):
+    """
+    Decode the items of a JSON array one by one, as the array is read.
+
+    `source` may be `bytes`, `str`, an iterable of `bytes` (or `str`) chunks, or a
+    binary file-like object. Only the item being decoded (and around one chunk of
+    the input) is held in memory at a time.
+    """
+    reader = _Reader(source, chunk_size)
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+    else:
+        while True:
+            yield reader.value()
+            if reader.peek() == ']':
+                reader.pos += 1
+                break
+            reader.expect(',')
+    if reader.peek() != '':
+        raise reader._error('Extra data')
@@ -1,89 +1,220 @@
-import requests
+import asyncio
+import concurrent.futures
+import dataclasses
+import datetime
+import functools
+import os
+import threading
 import warnings
+import weakref
+
+import requests
+import requests.adapters
+
+from . import storage
+from .pack import PackLoader  # noqa: F401 (re-exported, alongside the other loaders)
 
 
 class StatsbombAPIException(Exception):
     pass
 
 
+@dataclasses.dataclass(frozen=True)
+class ConnectionStats:
+    """ Request and connection counters for an `HTTPFetcher`. """
+    requests: int
+    connections: int
+
+    @property
+    def reused(self):
+        """ Number of requests served over an already-open connection. """
+        return max(self.requests - self.connections, 0)
+
+
 class HTTPFetcher:
-    def __init__(self, base_url, auth=None):
+    """
+    Fetch raw bytes from `base_url` over a pooled, keep-alive `requests.Session`.
+
+    A single session is shared by every thread using the fetcher. Connections are
+    kept open between requests (up to `pool_maxsize` per host) and responses are
+    requested gzip-compressed and decompressed transparently.
+    """
+    def __init__(self, base_url, auth=None, session=None, pool_connections=4,
+                 pool_maxsize=16, max_retries=0, timeout=None):
         self._base_url = base_url
         self._auth = auth
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._requests = 0
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive'
+            })
+        self._session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._session.close()
 
     @staticmethod
     def handle_non_ok_code(response):
         try:
             response.raise_for_status()
-        except requests.exceptions.BaseHTTPError as err:
+        except requests.exceptions.HTTPError as err:
             raise StatsbombAPIException(
                 f'Unexpected error code when trying to reach {response.url}: {response.status_code}'
             ) from err
 
+    def stats(self) -> ConnectionStats:
+        """ Count the requests made and connections opened so far. """
+        connections = 0
+        for adapter in set(self._session.adapters.values()):
+            poolmanager = getattr(adapter, 'poolmanager', None)
+            if poolmanager is None:
+                continue
+            for key in poolmanager.pools.keys():
+                pool = poolmanager.pools.get(key)
+                connections += getattr(pool, 'num_connections', 0)
+        with self._lock:
+            return ConnectionStats(requests=self._requests, connections=connections)
+
     def get(self, path) -> bytes:
-        response = requests.get(
+        with self._lock:
+            self._requests += 1
+        response = self._session.get(
             f'{self._base_url}/{path}',
-            auth=self._auth
+            auth=self._auth,
+            timeout=self._timeout
         )
         if response.status_code != 200:
             self.handle_non_ok_code(response)
         return response.content
 
+    def stream(self, path, chunk_size=2**16):
+        """
+        Fetch `path`, returning an iterator of (decompressed) chunks of the body
+        as they arrive.
 
-class StatsbombAPILoader:
-    def __init__(self, username, password):
+        The connection is returned to the pool once the iterator is exhausted or closed.
+        """
+        with self._lock:
+            self._requests += 1
+        response = self._session.get(
+            f'{self._base_url}/{path}',
+            auth=self._auth,
+            timeout=self._timeout,
+            stream=True
+        )
+        if response.status_code != 200:
+            with response:
+                self.handle_non_ok_code(response)
+        return _iter_response(response, chunk_size)
+
+
+def _iter_response(response, chunk_size):
+    with response:
+        yield from response.iter_content(chunk_size)
+
+
+class _HTTPLoader:
+    def _get(self, path):
+        if self._stream:
+            return self._http_fetcher.stream(path)
+        return self._http_fetcher.get(path)
+
+    def connection_stats(self) -> ConnectionStats:
+        return self._http_fetcher.stats()
+
+    def close(self):
+        self._http_fetcher.close()
+
+
+class StatsbombAPILoader(_HTTPLoader):
+    def __init__(self, username, password,
+                 base_url='https://data.statsbombservices.com/api', stream=False, **http_options):
+        self._stream = stream
         self._http_fetcher = HTTPFetcher(
-            base_url='https://data.statsbombservices.com/api',
-            auth=(username, password)
+            base_url=base_url,
+            auth=(username, password),
+            **http_options
         )
 
     def load_competitions(self, version='v2'):
-        return self._http_fetcher.get(f'{version}/competitions')
+        return self._get(f'{version}/competitions')
 
     def load_matches(self, competition_id, season_id, version='v3'):
-        return self._http_fetcher.get(f'{version}/competitions/{competition_id}/seasons/{season_id}/matches')
+        return self._get(f'{version}/competitions/{competition_id}/seasons/{season_id}/matches')
 
     def load_lineups(self, match_id, version='v2'):
-        return self._http_fetcher.get(f'{version}/lineups/{match_id}')
+        return self._get(f'{version}/lineups/{match_id}')
 
     def load_events(self, match_id, version='v5'):
-        return self._http_fetcher.get(f'{version}/events/{match_id}')
+        return self._get(f'{version}/events/{match_id}')
 
 
-class OpenDataLoader:
-    def __init__(self):
+class OpenDataLoader(_HTTPLoader):
+    def __init__(self, base_url='https://raw.githubusercontent.com/statsbomb/open-data/master/data',
+                 stream=False, **http_options):
         statsbomb_data_advice = (
             'Please be responsible with Statsbomb data and make sure you have '
             'registered your details on https://www.statsbomb.com/resource-centre, '
             'and read and accepted the User Agreement (available on the same page).'
         )
         warnings.warn(statsbomb_data_advice)
+        self._stream = stream
         self._http_fetcher = HTTPFetcher(
-            base_url='https://raw.githubusercontent.com/statsbomb/open-data/master/data'
+            base_url=base_url,
+            **http_options
         )
 
     def load_competitions(self):
-        return self._http_fetcher.get('competitions.json')
+        return self._get('competitions.json')
 
     def load_matches(self, competition_id: int, season_id: int):
-        return self._http_fetcher.get(f'matches/{competition_id}/{season_id}.json')
+        return self._get(f'matches/{competition_id}/{season_id}.json')
 
     def load_lineups(self, match_id: int):
-        return self._http_fetcher.get(f'lineups/{match_id}.json')
+        return self._get(f'lineups/{match_id}.json')
 
     def load_events(self, match_id: int):
-        return self._http_fetcher.get(f'events/{match_id}.json')
+        return self._get(f'events/{match_id}.json')
 
 
 class LocalLoader:
-    def __init__(self, base_dir, file_extension):
+    """
+    Load data from files in `base_dir`, named `{path}.{file_extension}`.
+
+    gzip- and zstd-compressed files are decompressed transparently. They may be
+    named either `{path}.{file_extension}` or with an additional `.gz` or `.zst`
+    extension.
+
+    With `mmap=True`, uncompressed files are memory-mapped and returned as
+    `memoryview`s rather than read into `bytes`. `decoders.JsonDecoder` decodes
+    these without an intermediate copy, so the raw file is not held on the heap
+    alongside the decoded data.
+    """
+    def __init__(self, base_dir, file_extension, mmap=False):
         self._base_dir = base_dir
         self._file_extension = file_extension
+        self._mmap = mmap
 
     def _read(self, path) -> bytes:
-        file_path = f'{self._base_dir}/{path}.{self._file_extension}'
-        with open(file_path, "rb") as fp:
-            return fp.read()
+        return storage.read(f'{self._base_dir}/{path}.{self._file_extension}', use_mmap=self._mmap)
 
     def load_competitions(self):
         return self._read('competitions')
@@ -96,3 +227,131 @@ class LocalLoader:
 
     def load_events(self, match_id):
         return self._read(f'events/{match_id}')
+
+
+class AsyncLoader:
+    """
+    Expose a (blocking) loader's routes as coroutines.
+
+    Each call runs on a thread pool so that many requests can be in flight at once.
+    At most `max_concurrency` requests are made concurrently; HTTP loaders should be
+    given a `pool_maxsize` at least this large so that every request gets a pooled
+    connection.
+    """
+    def __init__(self, loader, max_concurrency=16):
+        self.loader = loader
+        self.max_concurrency = max_concurrency
+        # One per event loop (e.g. for each `asyncio.run`), since a semaphore can
+        # only be used from the loop it's first used in
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._executor = None
+
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='statsbombapi'
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if hasattr(self.loader, 'close'):
+            self.loader.close()
+
+    async def load_competitions(self):
+        return await self._run(self.loader.load_competitions)
+
+    async def load_matches(self, competition_id, season_id):
+        return await self._run(self.loader.load_matches, competition_id, season_id)
+
+    async def load_lineups(self, match_id):
+        return await self._run(self.loader.load_lineups, match_id)
+
+    async def load_events(self, match_id):
+        return await self._run(self.loader.load_events, match_id)
+
+
+class CachingLoader:
+    """
+    Cache the responses of another loader on disk.
+
+    Responses are stored under `cache_dir` in the same layout as `LocalLoader`.
+    When the cache grows beyond `max_bytes`, the least recently used responses are
+    evicted. `ttl` maps each route to a `datetime.timedelta` after which cached
+    responses are re-fetched (or `None` to keep them until evicted); routes not
+    given in `ttl` use `CachingLoader.DEFAULT_TTL`. Responses can be stored
+    compressed with `compression='gzip'` or `'zstd'`.
+    """
+    DEFAULT_TTL = {
+        'competitions': datetime.timedelta(days=1),
+        'matches': datetime.timedelta(hours=1),
+        'lineups': None,
+        'events': None,
+    }
+
+    def __init__(self, loader, cache_dir, max_bytes=None, ttl=None, file_extension='json',
+                 compression=None):
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.ttl = {**self.DEFAULT_TTL, **(ttl or {})}
+        self._cache_dir = cache_dir
+        self._file_extension = file_extension
+        self._compression = compression
+        self._store = storage.LRUStore(
+            cache_dir, storage.compressed_path(f'.{file_extension}', compression), max_bytes, compression
+        )
+
+    @property
+    def hits(self):
+        return self._store.hits
+
+    @property
+    def misses(self):
+        return self._store.misses
+
+    def _file_path(self, route, *args):
+        path = storage.route_path(route, *args)
+        return storage.compressed_path(
+            os.path.join(self._cache_dir, f'{path}.{self._file_extension}'),
+            self._compression
+        )
+
+    def _load(self, route, *args):
+        file_path = self._file_path(route, *args)
+        ttl = self.ttl.get(route)
+        content = self._store.read(file_path, None if ttl is None else ttl.total_seconds())
+        if content is None:
+            content = getattr(self.loader, f'load_{route}')(*args)
+            self._store.write(file_path, content)
+        return content
+
+    def cache_size(self):
+        """ Total size (in bytes) of the cached responses. """
+        return self._store.size()
+
+    def load_competitions(self):
+        return self._load('competitions')
+
+    def load_matches(self, competition_id, season_id):
+        return self._load('matches', competition_id, season_id)
+
+    def load_lineups(self, match_id):
+        return self._load('lineups', match_id)
+
+    def load_events(self, match_id):
+        return self._load('events', match_id)
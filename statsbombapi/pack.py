@@ -0,0 +1,145 @@
+"""
+Pack files: all of a competition season's matches, lineups and events in a single file
+
+A pack file is laid out as:
+
+    magic        8 bytes   b'SBPACK\\x00\\x01'
+    index size   8 bytes   unsigned, little-endian
+    index        JSON      {"competition": {...}, "entries": {path: [offset, length], ...}}
+    data         the raw responses, back to back
+
+where each entry's path is given by `storage.route_path` (e.g. `events/1234`) and
+its offset is relative to the start of the data section.
+"""
+import glob
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+from . import decoders, storage
+
+
+MAGIC = b'SBPACK\x00\x01'
+FILE_EXTENSION = 'sbpack'
+_HEADER = struct.Struct('<8sQ')
+
+
+class PackFormatError(Exception):
+    pass
+
+
+def write_pack(path, loader, competition_id, season_id):
+    """
+    Write the matches, and the lineups and events of each available match, of a
+    competition season from `loader` into a single pack file at `path`.
+
+    The season must be listed in `loader`'s competitions, as the pack includes its
+    competition record.
+    """
+    competition = next(
+        (c for c in decoders._json_loads(loader.load_competitions())
+         if (c['competition_id'], c['season_id']) == (competition_id, season_id)),
+        None
+    )
+    if competition is None:
+        raise ValueError(f'Competition {competition_id}, season {season_id} is not in the competitions')
+    entries = {}
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryFile(dir=directory) as data:
+        def add(route, *args):
+            content = getattr(loader, f'load_{route}')(*args)
+            entries[storage.route_path(route, *args)] = [data.tell(), len(content)]
+            data.write(content)
+            return content
+
+        matches = decoders._json_loads(add('matches', competition_id, season_id))
+        for match in matches:
+            if match.get('match_status', 'available') != 'available':
+                continue
+            add('lineups', match['match_id'])
+            add('events', match['match_id'])
+
+        index = json.dumps({'competition': competition, 'entries': entries}).encode('utf8')
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(_HEADER.pack(MAGIC, len(index)))
+                fp.write(index)
+                data.seek(0)
+                shutil.copyfileobj(data, fp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class Pack:
+    """ A memory-mapped pack file. """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise PackFormatError(f'{path} is not a pack file')
+        index_end = _HEADER.size + index_size
+        index = json.loads(self._mmap[_HEADER.size:index_end])
+        self.competition = index['competition']
+        self.entries = index['entries']
+        self._data_start = index_end
+
+    def read(self, path) -> memoryview:
+        """ A zero-copy view of the response stored at `path`. """
+        offset, length = self.entries[path]
+        start = self._data_start + offset
+        return memoryview(self._mmap)[start:start + length]
+
+    def close(self):
+        self._mmap.close()
+
+
+class PackLoader:
+    """
+    Load data from the pack files (`*.sbpack`) in `base_dir` and its subdirectories.
+
+    Matches, lineups and events are returned as zero-copy `memoryview`s of the
+    memory-mapped pack files. `decoders.JsonDecoder` accepts these directly; pass
+    `copy=True` to get `bytes` instead.
+    """
+    def __init__(self, base_dir, copy=False):
+        self._copy = copy
+        self._packs = [
+            Pack(path)
+            for path in sorted(glob.glob(os.path.join(base_dir, '**', f'*.{FILE_EXTENSION}'), recursive=True))
+        ]
+        self._paths = {path: pack for pack in self._packs for path in pack.entries}
+        self._competitions = json.dumps([pack.competition for pack in self._packs]).encode('utf8')
+
+    def _read(self, path):
+        try:
+            pack = self._paths[path]
+        except KeyError:
+            raise FileNotFoundError(f'No pack contains {path}') from None
+        content = pack.read(path)
+        return bytes(content) if self._copy else content
+
+    def close(self):
+        for pack in self._packs:
+            pack.close()
+
+    def load_competitions(self):
+        return self._competitions
+
+    def load_matches(self, competition_id, season_id):
+        return self._read(storage.route_path('matches', competition_id, season_id))
+
+    def load_lineups(self, match_id):
+        return self._read(storage.route_path('lineups', match_id))
+
+    def load_events(self, match_id):
+        return self._read(storage.route_path('events', match_id))
@@ -0,0 +1,101 @@
+"""
+Decode many raw responses (e.g. a season's events) in parallel, on a pool of processes
+
+Decoding is CPU-bound, so threads don't help. Instead, `ParallelDecoder` sends the
+raw payloads to worker processes and sends the decoded results back. Columnar
+results (`frame.EventsFrame`s, Arrow tables and DataFrames) are a few flat arrays,
+so are much cheaper to send back than graphs of dataclasses, and `merge` joins
+them into one (with a `match_id` column).
+"""
+import concurrent.futures
+import itertools
+import sys
+import typing
+
+from . import decoders, frame
+
+
+# The decoder of each worker process, set once when it starts
+_decoder = None
+
+
+def _set_decoder(decoder):
+    global _decoder
+    _decoder = decoder
+
+
+def _decode(route, payload):
+    return getattr(_decoder, f'decode_{route}')(payload)
+
+
+def _payload(s):
+    # Memory-mapped responses can't be pickled
+    return bytes(s) if isinstance(s, memoryview) else s
+
+
+def merge(results: typing.Mapping[int, typing.Any]):
+    """
+    Join each match's decoded results into one, with a `match_id` column.
+
+    `EventsFrame`s are concatenated (merging their team, player and event type
+    dictionaries), as are Arrow tables and DataFrames. Other results (e.g. lists
+    of dataclasses) are returned unchanged, by match id.
+    """
+    match_ids = list(results)
+    values = list(results.values())
+    if not values:
+        return results
+    first = values[0]
+    if isinstance(first, frame.EventsFrame):
+        return frame.EventsFrame.concat(values, match_ids)
+    # NOTE: pyarrow and pandas are slow to import, and results can only be their
+    # tables or DataFrames if they already are
+    pa = sys.modules.get('pyarrow')
+    if pa is not None and isinstance(first, pa.Table):
+        return pa.concat_tables([
+            table.add_column(0, 'match_id', pa.array([match_id] * table.num_rows, pa.int64()))
+            for match_id, table in zip(match_ids, values)
+        ])
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(first, pd.DataFrame):
+        merged = pd.concat(values, keys=match_ids, names=['match_id', None])
+        return merged.reset_index(level='match_id').reset_index(drop=True)
+    return results
+
+
+class ParallelDecoder:
+    """
+    Decode responses with `decoder` (by default, `decoders.EventsFrameDecoder()`)
+    on a pool of `max_workers` processes (default: one per CPU).
+
+    The decoder must be picklable; it's sent to each worker once, when it starts.
+    Use as a context manager, or call `close` when done.
+    """
+    def __init__(self, decoder=None, max_workers=None):
+        if decoder is None:
+            decoder = decoders.EventsFrameDecoder()
+        self.decoder = decoder
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers, initializer=_set_decoder, initargs=(decoder,)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def map(self, route: str, payloads: typing.Iterable, chunksize=1) -> typing.Iterator:
+        """ Decode each of `payloads` (raw responses of `route`), yielding the results in order. """
+        return self._executor.map(_decode, itertools.repeat(route), map(_payload, payloads), chunksize=chunksize)
+
+    def lineups(self, payloads: typing.Mapping[int, typing.Any]):
+        """ Decode raw lineups, by match id, and `merge` them. """
+        return merge(dict(zip(payloads, self.map('lineups', payloads.values()))))
+
+    def events(self, payloads: typing.Mapping[int, typing.Any]):
+        """ Decode raw events, by match id, and `merge` them. """
+        return merge(dict(zip(payloads, self.map('events', payloads.values()))))
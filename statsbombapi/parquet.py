@@ -0,0 +1,135 @@
+"""
+Parquet datasets: API responses as Arrow tables on disk, partitioned by competition season
+
+A dataset is laid out as:
+
+    competitions/competitions.parquet
+    matches/competition_id=<id>/season_id=<id>/matches.parquet
+    lineups/competition_id=<id>/season_id=<id>/<match_id>.parquet
+    events/competition_id=<id>/season_id=<id>/<match_id>.parquet
+
+with the columns given by `flatten.columns` (plus a `match_id` column for lineups
+and events). Because each file is columnar and each season is a separate
+(hive-style) partition, `ParquetReader` only reads the columns and seasons it's
+asked for.
+"""
+import json
+import os
+import typing
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = ds = pq = None
+
+from . import arrow, decoders, storage
+
+
+PARTITIONS = ('competition_id', 'season_id')
+FILE_EXTENSION = 'parquet'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError('Parquet datasets require the `pyarrow` package (`pip install pyarrow`)')
+
+
+def partition_path(route, competition_id, season_id):
+    """ Path (relative) of the directory holding a competition season's files of `route`. """
+    return f'{route}/competition_id={competition_id}/season_id={season_id}'
+
+
+class ParquetWriter:
+    """
+    Write (parsed) responses to the dataset at `base_dir`.
+
+    Files are written atomically, and writing a response again replaces it.
+    """
+    def __init__(self, base_dir, compression='zstd'):
+        _require_pyarrow()
+        self.base_dir = base_dir
+        self.compression = compression
+
+    def _write(self, path, table):
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression=self.compression)
+        storage.write_atomic(os.path.join(self.base_dir, path), sink.getvalue().to_pybytes())
+
+    def write_competitions(self, response):
+        self._write(f'competitions/competitions.{FILE_EXTENSION}', arrow.table('competitions', response))
+
+    def write_matches(self, competition_id, season_id, response):
+        # NOTE: the partition columns are given by the directory
+        table = arrow.table('matches', response).drop(list(PARTITIONS))
+        self._write(f'{partition_path("matches", competition_id, season_id)}/matches.{FILE_EXTENSION}', table)
+
+    def _write_match(self, route, competition_id, season_id, match_id, response):
+        table = arrow.table(route, response)
+        table = table.add_column(0, 'match_id', pa.array([match_id] * table.num_rows, pa.int64()))
+        self._write(f'{partition_path(route, competition_id, season_id)}/{match_id}.{FILE_EXTENSION}', table)
+
+    def write_lineups(self, competition_id, season_id, match_id, response):
+        self._write_match('lineups', competition_id, season_id, match_id, response)
+
+    def write_events(self, competition_id, season_id, match_id, response):
+        self._write_match('events', competition_id, season_id, match_id, response)
+
+    def write_season(self, loader, competition_id, season_id):
+        """
+        Write the competitions, and the matches and each available match's lineups
+        and events of a competition season, from `loader`.
+        """
+        self.write_competitions(decoders._json_loads(loader.load_competitions()))
+        matches = decoders._json_loads(loader.load_matches(competition_id, season_id))
+        self.write_matches(competition_id, season_id, matches)
+        for match in matches:
+            if match.get('match_status', 'available') != 'available':
+                continue
+            match_id = match['match_id']
+            lineups = decoders._json_loads(loader.load_lineups(match_id))
+            self.write_lineups(competition_id, season_id, match_id, lineups)
+            events = decoders._json_loads(loader.load_events(match_id))
+            self.write_events(competition_id, season_id, match_id, events)
+
+
+class ParquetReader:
+    """
+    Read tables from the dataset at `base_dir`.
+
+    Each route can be filtered by competition, season and (for lineups and events)
+    match, and only the given `columns` (or all, if None) are read. Only the files
+    of the selected seasons are opened.
+    """
+    def __init__(self, base_dir):
+        _require_pyarrow()
+        self.base_dir = base_dir
+
+    def _read(self, route, columns=None, competition_id=None, season_id=None, match_ids=None):
+        dataset = ds.dataset(os.path.join(self.base_dir, route), format=FILE_EXTENSION, partitioning='hive')
+        filters = []
+        if competition_id is not None:
+            filters.append(ds.field('competition_id') == competition_id)
+        if season_id is not None:
+            filters.append(ds.field('season_id') == season_id)
+        if match_ids is not None:
+            filters.append(ds.field('match_id').isin(list(match_ids)))
+        expression = None
+        for f in filters:
+            expression = f if expression is None else expression & f
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def competitions(self, columns=None) -> 'pa.Table':
+        return self._read('competitions', columns)
+
+    def matches(self, competition_id=None, season_id=None, columns=None) -> 'pa.Table':
+        return self._read('matches', columns, competition_id, season_id)
+
+    def lineups(self, competition_id=None, season_id=None,
+                match_ids: typing.Optional[typing.Iterable[int]] = None, columns=None) -> 'pa.Table':
+        return self._read('lineups', columns, competition_id, season_id, match_ids)
+
+    def events(self, competition_id=None, season_id=None,
+               match_ids: typing.Optional[typing.Iterable[int]] = None, columns=None) -> 'pa.Table':
+        return self._read('events', columns, competition_id, season_id, match_ids)
@@ -0,0 +1,239 @@
+"""
+Helpers for storing raw StatsBomb responses on disk, in the layout read by
+`loaders.LocalLoader`
+"""
+import collections
+import contextlib
+import gzip
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ROUTES = ('competitions', 'matches', 'lineups', 'events')
+
+# File extension and magic number of each supported compression codec
+COMPRESSION_EXTENSIONS = {
+    'gzip': 'gz',
+    'zstd': 'zst',
+}
+_MAGIC_NUMBERS = {
+    b'\x1f\x8b': 'gzip',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+}
+
+
+def route_path(route, *args):
+    """ Path (relative, without extension) at which a route's response is stored. """
+    if route == 'competitions':
+        return 'competitions'
+    if route == 'matches':
+        competition_id, season_id = args
+        return f'matches/{competition_id}/{season_id}'
+    if route in ('lineups', 'events'):
+        match_id, = args
+        return f'{route}/{match_id}'
+    raise ValueError(f'Unknown route: {route}')
+
+
+def write_atomic(path, content: bytes):
+    """
+    Write `content` to `path` so that readers only ever see the complete file.
+
+    The data is written to a temporary file in the same directory, then moved
+    into place.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(content)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError('zstd compression requires the `zstandard` package (`pip install zstandard`)')
+
+
+def compressed_path(file_path, compression):
+    """ Path at which a file compressed with `compression` (or `None`) is stored. """
+    if compression is None:
+        return file_path
+    return f'{file_path}.{COMPRESSION_EXTENSIONS[compression]}'
+
+
+def sniff_compression(content):
+    """ Detect the compression codec of `content` from its magic number, if any. """
+    for magic, compression in _MAGIC_NUMBERS.items():
+        if content[:len(magic)] == magic:
+            return compression
+    return None
+
+
+def compress(content: bytes, compression, level=None) -> bytes:
+    if compression is None:
+        return content
+    if compression == 'gzip':
+        return gzip.compress(content, compresslevel=6 if level is None else level)
+    if compression == 'zstd':
+        _require_zstandard()
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(content)
+    raise ValueError(f'Unknown compression: {compression}')
+
+
+def decompress(content: bytes) -> bytes:
+    """ Decompress `content` if it is gzip- or zstd-compressed, otherwise return it unchanged. """
+    compression = sniff_compression(content)
+    if compression == 'gzip':
+        return gzip.decompress(content)
+    if compression == 'zstd':
+        _require_zstandard()
+        # Frames written by streaming compressors may not record their size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+    return content
+
+
+def _read_mmap(fp):
+    try:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can't be mapped
+        return b''
+    if sniff_compression(mapped) is not None:
+        return decompress(mapped)
+    return memoryview(mapped)
+
+
+def read(file_path, use_mmap=False):
+    """
+    Read and decompress the file at `file_path`.
+
+    The file may also be stored compressed, at `file_path` plus `.gz` or `.zst`. If
+    there is more than one variant (e.g. an old uncompressed copy, and a newer
+    compressed one), the most recently modified is read. With `use_mmap=True`,
+    uncompressed files are memory-mapped and returned as a (read-only)
+    `memoryview`, instead of being copied into `bytes`.
+    """
+    candidates = []
+    for candidate in [file_path] + [compressed_path(file_path, c) for c in COMPRESSION_EXTENSIONS]:
+        try:
+            candidates.append((os.stat(candidate).st_mtime_ns, candidate))
+        except FileNotFoundError:
+            continue
+    # Newest first (stable, so the uncompressed file wins ties)
+    candidates.sort(key=lambda c: -c[0])
+    for _, candidate in candidates:
+        try:
+            with open(candidate, 'rb') as fp:
+                if use_mmap:
+                    return _read_mmap(fp)
+                return decompress(fp.read())
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(f'No such file (or compressed variant): {file_path}')
+
+
+class LRUStore:
+    """
+    Files under `base_dir` (those ending in `suffix`), of which the least recently
+    used are deleted once their total size exceeds `max_bytes`.
+
+    The LRU order is kept in memory, and recovered from the files' access times
+    (which are updated on every hit) when the store is created. Contents are
+    compressed with `compression` (if any) when written, and decompressed when read.
+    """
+    def __init__(self, base_dir, suffix, max_bytes=None, compression=None):
+        self.base_dir = base_dir
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = self._scan()
+        self._size = sum(self._entries.values())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _scan(self):
+        files = []
+        for directory, _, filenames in os.walk(self.base_dir):
+            for filename in filenames:
+                if not filename.endswith(self.suffix):
+                    continue
+                file_path = os.path.join(directory, filename)
+                stat = os.stat(file_path)
+                files.append((stat.st_atime, file_path, stat.st_size))
+        return collections.OrderedDict((path, size) for _, path, size in sorted(files))
+
+    def size(self):
+        """ Total size (in bytes) of the stored files. """
+        with self._lock:
+            return self._size
+
+    def read(self, file_path, max_age=None):
+        """
+        The (decompressed) content of `file_path`, or None if it isn't stored or
+        was written more than `max_age` seconds ago.
+        """
+        try:
+            stat = os.stat(file_path)
+            if max_age is not None and time.time() - stat.st_mtime >= max_age:
+                return None
+            with open(file_path, 'rb') as fp:
+                content = decompress(fp.read())
+            os.utime(file_path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            # Not stored, or evicted by another thread
+            return None
+        with self._lock:
+            if file_path in self._entries:
+                self._entries.move_to_end(file_path)
+            else:
+                # Written by another process (e.g. a worker) since the store was scanned
+                self._entries[file_path] = stat.st_size
+                self._size += stat.st_size
+                self._evict()
+            self.hits += 1
+        return content
+
+    def write(self, file_path, content: bytes):
+        """ Store `content` (atomically) at `file_path`, evicting older files if needed. """
+        content = compress(content, self.compression)
+        write_atomic(file_path, content)
+        with self._lock:
+            self.misses += 1
+            self._size += len(content) - self._entries.pop(file_path, 0)
+            self._entries[file_path] = len(content)
+            self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            file_path, size = self._entries.popitem(last=False)
+            self._size -= size
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file_path)
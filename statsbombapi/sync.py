@@ -0,0 +1,313 @@
+"""
+Incrementally download StatsBomb data into a directory readable by `loaders.LocalLoader`
+"""
+import collections
+import concurrent.futures
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import threading
+import typing
+
+from . import decoders, storage
+
+
+def _parse_timestamp(x):
+    return datetime.datetime.fromisoformat(x) if x else None
+
+
+def _is_newer(remote, local):
+    remote, local = _parse_timestamp(remote), _parse_timestamp(local)
+    return remote is not None and (local is None or remote > local)
+
+
+class Manifest:
+    """
+    Record of the `match_updated` (per competition season) and `last_updated`
+    (per match) timestamps of the data last downloaded.
+    """
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as fp:
+                manifest = json.load(fp)
+        except FileNotFoundError:
+            manifest = {}
+        self.seasons = manifest.get('seasons', {})
+        self.matches = manifest.get('matches', {})
+
+    @staticmethod
+    def season_key(competition_id, season_id):
+        return f'{competition_id}/{season_id}'
+
+    def season_changed(self, competition_id, season_id, match_updated):
+        key = self.season_key(competition_id, season_id)
+        return key not in self.seasons or _is_newer(match_updated, self.seasons[key])
+
+    def match_changed(self, match_id, last_updated):
+        key = str(match_id)
+        return key not in self.matches or _is_newer(last_updated, self.matches[key])
+
+    def save(self):
+        content = json.dumps({'seasons': self.seasons, 'matches': self.matches}, indent=2)
+        storage.write_atomic(self.path, content.encode('utf8'))
+
+
+@dataclasses.dataclass
+class SyncReport:
+    seasons_checked: int = 0
+    seasons_updated: typing.List[typing.Tuple[int, int]] = dataclasses.field(default_factory=list)
+    matches_updated: typing.List[int] = dataclasses.field(default_factory=list)
+    files_written: int = 0
+    errors: typing.Dict[typing.Any, Exception] = dataclasses.field(default_factory=dict)
+
+
+class Synchronizer:
+    """
+    Keep a local copy of StatsBomb data up to date, downloading only what has changed.
+
+    Responses from `loader` are written under `base_dir` in the layout read by
+    `loaders.LocalLoader`. A competition season's matches are re-downloaded only
+    when its `match_updated` timestamp has moved on since the last sync, and a
+    match's lineups and events only when its `last_updated` timestamp has.
+
+    Files can be written compressed with `compression='gzip'` or `'zstd'`.
+    """
+    def __init__(self, loader, base_dir, file_extension='json', manifest_path=None, compression=None):
+        self.loader = loader
+        self.manifest = Manifest(manifest_path or os.path.join(base_dir, 'manifest.json'))
+        self._base_dir = base_dir
+        self._file_extension = file_extension
+        self._compression = compression
+
+    def _write(self, report, route, *args, content):
+        path = storage.route_path(route, *args)
+        storage.write_atomic(
+            storage.compressed_path(os.path.join(self._base_dir, f'{path}.{self._file_extension}'), self._compression),
+            storage.compress(content, self._compression)
+        )
+        report.files_written += 1
+
+    def sync(self, seasons=None) -> SyncReport:
+        """
+        Download any new or updated data.
+
+        If given, only the competition seasons in `seasons` (an iterable of
+        `(competition_id, season_id)` tuples) are synced. Errors are collected in the
+        report, and anything that failed is retried on the next sync.
+        """
+        report = SyncReport()
+        seasons = None if seasons is None else set(seasons)
+
+        raw_competitions = self.loader.load_competitions()
+        self._write(report, 'competitions', content=raw_competitions)
+
+        try:
+            for competition in decoders._json_loads(raw_competitions):
+                competition_id, season_id = competition['competition_id'], competition['season_id']
+                if seasons is not None and (competition_id, season_id) not in seasons:
+                    continue
+                report.seasons_checked += 1
+                if self.manifest.season_changed(competition_id, season_id, competition.get('match_updated')):
+                    self._sync_season(report, competition_id, season_id, competition.get('match_updated'))
+        finally:
+            self.manifest.save()
+
+        return report
+
+    def _sync_season(self, report, competition_id, season_id, match_updated):
+        try:
+            raw_matches = self.loader.load_matches(competition_id, season_id)
+        except Exception as err:
+            report.errors[(competition_id, season_id)] = err
+            return
+        self._write(report, 'matches', competition_id, season_id, content=raw_matches)
+
+        complete = True
+        for match in decoders._json_loads(raw_matches):
+            match_id = match['match_id']
+            if match.get('match_status') != 'available':
+                continue
+            if not self.manifest.match_changed(match_id, match.get('last_updated')):
+                continue
+            try:
+                raw_lineups = self.loader.load_lineups(match_id)
+                raw_events = self.loader.load_events(match_id)
+            except Exception as err:
+                report.errors[match_id] = err
+                complete = False
+                continue
+            self._write(report, 'lineups', match_id, content=raw_lineups)
+            self._write(report, 'events', match_id, content=raw_events)
+            self.manifest.matches[str(match_id)] = match.get('last_updated')
+            report.matches_updated.append(match_id)
+
+        # Only mark the season as synced once all of its matches are up to date
+        if complete:
+            self.manifest.seasons[Manifest.season_key(competition_id, season_id)] = match_updated
+            report.seasons_updated.append((competition_id, season_id))
+
+
+class Journal:
+    """
+    Append-only log of the files completely written by a `Mirror`, with their
+    size, SHA-256 digest and the `last_updated` timestamp of their match.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf8') as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last line may have been cut off by a crash
+                        continue
+                    self.entries[entry['path']] = entry
+        except FileNotFoundError:
+            pass
+
+    def is_complete(self, path, file_path, verify_hash=False, last_updated=None):
+        """
+        Whether `path` was journaled (for the same `last_updated` timestamp), and
+        `file_path` still matches the journal.
+        """
+        entry = self.entries.get(path)
+        if entry is None or entry.get('last_updated') != last_updated:
+            return False
+        try:
+            if os.path.getsize(file_path) != entry['size']:
+                return False
+            if verify_hash:
+                with open(file_path, 'rb') as fp:
+                    return hashlib.sha256(fp.read()).hexdigest() == entry['sha256']
+        except FileNotFoundError:
+            return False
+        return True
+
+    def record(self, path, content, last_updated=None):
+        entry = {
+            'path': path,
+            'size': len(content),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'last_updated': last_updated,
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf8') as fp:
+                fp.write(json.dumps(entry) + '\n')
+            self.entries[path] = entry
+
+
+@dataclasses.dataclass
+class MirrorReport:
+    files_written: int = 0
+    files_skipped: int = 0
+    errors: typing.Dict[str, Exception] = dataclasses.field(default_factory=dict)
+
+
+class Mirror:
+    """
+    Copy everything available from `loader` into `base_dir`, in the layout read by
+    `loaders.LocalLoader`.
+
+    Responses are fetched on `max_workers` threads, checked to be valid JSON, and
+    written atomically. The competitions and each season's matches are fetched
+    afresh every run, so score and status updates are mirrored. Each match's
+    completed lineups and events are recorded in a journal, so an interrupted
+    mirror resumes where it left off: files in the journal whose size (or, with
+    `verify_hash=True`, SHA-256 digest) still matches are not fetched again, unless
+    their match's `last_updated` timestamp has changed.
+
+    Files can be written compressed with `compression='gzip'` or `'zstd'`.
+    """
+    def __init__(self, loader, base_dir, file_extension='json', max_workers=8,
+                 journal_path=None, verify_hash=False, compression=None):
+        self.loader = loader
+        self.max_workers = max_workers
+        self.verify_hash = verify_hash
+        self.journal = Journal(journal_path or os.path.join(base_dir, 'journal.jsonl'))
+        self._base_dir = base_dir
+        self._file_extension = file_extension
+        self._compression = compression
+        self._lock = threading.Lock()
+
+    def _file_path(self, path):
+        return storage.compressed_path(
+            os.path.join(self._base_dir, f'{path}.{self._file_extension}'),
+            self._compression
+        )
+
+    def _write(self, report, file_path, content):
+        """ Write a (valid) raw response. Returns the written (compressed) bytes. """
+        compressed = storage.compress(content, self._compression)
+        storage.write_atomic(file_path, compressed)
+        with self._lock:
+            report.files_written += 1
+        return compressed
+
+    def _fetch(self, report, route, *args, last_updated=None):
+        """ Fetch and write a match's response, unless already mirrored. """
+        path = storage.route_path(route, *args)
+        file_path = self._file_path(path)
+        if self.journal.is_complete(path, file_path, self.verify_hash, last_updated):
+            with self._lock:
+                report.files_skipped += 1
+            return
+
+        content = getattr(self.loader, f'load_{route}')(*args)
+        decoders._json_loads(content)
+        compressed = self._write(report, file_path, content)
+        self.journal.record(path, compressed, last_updated)
+
+    def _fetch_matches(self, report, route, *args):
+        """ Fetch and write a season's matches (whether or not already mirrored), and parse them. """
+        content = self.loader.load_matches(*args)
+        matches = decoders._json_loads(content)
+        self._write(report, self._file_path(storage.route_path(route, *args)), content)
+        return matches
+
+    def _run_all(self, pool, report, func, jobs):
+        futures = {
+            pool.submit(func, report, route, *args, **kwargs): storage.route_path(route, *args)
+            for route, args, kwargs in jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                report.errors[futures[future]] = error
+            else:
+                yield future.result()
+
+    def run(self, seasons=None) -> MirrorReport:
+        """
+        Mirror the competitions, and the matches, lineups and events of each
+        competition season (or only those in `seasons`, an iterable of
+        `(competition_id, season_id)` tuples).
+        """
+        report = MirrorReport()
+        seasons = None if seasons is None else set(seasons)
+
+        # Always fetch the competitions afresh: they're small, and list what to mirror
+        raw_competitions = self.loader.load_competitions()
+        storage.write_atomic(self._file_path('competitions'), storage.compress(raw_competitions, self._compression))
+        season_jobs = [
+            ('matches', (c['competition_id'], c['season_id']), {})
+            for c in decoders._json_loads(raw_competitions)
+            if seasons is None or (c['competition_id'], c['season_id']) in seasons
+        ]
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as pool:
+            match_jobs = [
+                (route, (match['match_id'],), {'last_updated': match.get('last_updated')})
+                for matches in self._run_all(pool, report, self._fetch_matches, season_jobs)
+                for match in matches
+                if match.get('match_status', 'available') == 'available'
+                for route in ('lineups', 'events')
+            ]
+            collections.deque(self._run_all(pool, report, self._fetch, match_jobs), maxlen=0)
+
+        return report
@@ -311,3 +311,93 @@ EVENTS = {
         },
     ]
 }
+
+
+# Events not covered above: a starting XI, a shot with a freeze frame, and a 50/50
+MORE_EVENTS = {
+    "v5": [
+        {
+            "id": "6c5d1c87-9d67-4a8a-a2ad-4e7b0b8bd4f5",
+            "index": 1,
+            "period": 1,
+            "timestamp": "00:00:00.000",
+            "minute": 0,
+            "second": 0,
+            "type": {"id": 35, "name": "Starting XI"},
+            "possession": 1,
+            "possession_team": {"id": 749, "name": "Team A"},
+            "play_pattern": {"id": 1, "name": "Regular Play"},
+            "team": {"id": 966, "name": "Team B"},
+            "duration": 0,
+            "tactics": {
+                "formation": 442,
+                "lineup": [
+                    {
+                        "player": {"id": 15611, "name": "Player X"},
+                        "position": {"id": 23, "name": "Center Forward"},
+                        "jersey_number": 9,
+                    },
+                ],
+            },
+        },
+        {
+            "id": "e1b5fbd3-2bdf-4a4a-9ad3-6b1c1e0a5d8c",
+            "index": 120,
+            "period": 1,
+            "timestamp": "00:04:12.318",
+            "minute": 4,
+            "second": 12,
+            "type": {"id": 16, "name": "Shot"},
+            "possession": 9,
+            "possession_team": {"id": 966, "name": "Team B"},
+            "play_pattern": {"id": 1, "name": "Regular Play"},
+            "team": {"id": 966, "name": "Team B"},
+            "player": {"id": 15611, "name": "Player X"},
+            "position": {"id": 23, "name": "Center Forward"},
+            "location": [108.1, 36],
+            "duration": 0.84,
+            "under_pressure": True,
+            "related_events": ["0f6ac2b5-7c3c-4c4d-b9b8-1f3a8d1e4c6b"],
+            "shot": {
+                "statsbomb_xg": 0.12,
+                "end_location": [120.0, 38.2, 1.1],
+                "key_pass_id": "0f6ac2b5-7c3c-4c4d-b9b8-1f3a8d1e4c6b",
+                "technique": {"id": 93, "name": "Normal"},
+                "body_part": {"id": 40, "name": "Right Foot"},
+                "type": {"id": 87, "name": "Open Play"},
+                "outcome": {"id": 97, "name": "Goal"},
+                "first_time": True,
+                "freeze_frame": [
+                    {
+                        "location": [118.5, 40.0],
+                        "player": {"id": 3089, "name": "Keeper Z"},
+                        "position": {"id": 1, "name": "Goalkeeper"},
+                        "teammate": False,
+                    },
+                    {
+                        "location": [104.0, 30.2],
+                        "player": {"id": 15547, "name": "Player Y"},
+                        "position": {"id": 19, "name": "Center Attacking Midfield"},
+                        "teammate": True,
+                    },
+                ],
+            },
+        },
+        {
+            "id": "9a7f3b44-3c0f-4f5e-8b8e-2e7e3a6f1d22",
+            "index": 121,
+            "period": 1,
+            "timestamp": "00:04:20.001",
+            "minute": 4,
+            "second": 20,
+            "type": {"id": 33, "name": "50/50"},
+            "possession": 10,
+            "possession_team": {"id": 749, "name": "Team A"},
+            "play_pattern": {"id": 4, "name": "From Throw In"},
+            "team": {"id": 749, "name": "Team A"},
+            "player": {"id": 3089, "name": "Keeper Z"},
+            "location": [20, 41.5],
+            "50_50": {"outcome": {"id": 108, "name": "Won"}},
+        },
+    ]
+}
@@ -0,0 +1,77 @@
+"""
+A local stand-in for the open-data repo, serving the (mocked) data in `data.py`
+"""
+import contextlib
+import gzip
+import http.server
+import json
+import threading
+
+import data
+
+
+MATCH_IDS = (1234, 4321)
+
+
+def open_data_routes():
+    """ Map open-data paths to the raw bytes served for them. """
+    routes = {
+        'competitions.json': data.COMPETITIONS['v2'],
+        'matches/4/3.json': data.MATCHES['v3'],
+    }
+    for match_id in MATCH_IDS:
+        routes[f'lineups/{match_id}.json'] = data.LINEUPS['v2']
+        routes[f'events/{match_id}.json'] = data.EVENTS['v5']
+    return {path: json.dumps(body).encode('utf8') for path, body in routes.items()}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.server.routes.get(self.path.lstrip('/'))
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.routes = routes
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+@contextlib.contextmanager
+def serve(routes=None):
+    """ Serve `routes` (default: `open_data_routes()`) on localhost in a background thread. """
+    server = _Server(open_data_routes() if routes is None else routes)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        server.url = f'http://{host}:{port}'
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
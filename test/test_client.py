@@ -0,0 +1,216 @@
+"""
+Test the API clients against a local stand-in HTTP server
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import statsbombapi
+import server
+
+
+def _open_data_loader(url, **kwargs):
+    with pytest.warns(UserWarning):
+        return statsbombapi.loaders.OpenDataLoader(base_url=url, **kwargs)
+
+
+def test_async_client():
+    async def fetch_all(client):
+        competitions = await client.competitions()
+        matches = await client.matches(4, 3)
+        events = await asyncio.gather(*[client.events(m) for m in server.MATCH_IDS])
+        lineups = await asyncio.gather(*[client.lineups(m) for m in server.MATCH_IDS])
+        return competitions, matches, events, lineups
+
+    with server.serve() as srv:
+        sync_client = statsbombapi.APIClient(
+            loader=_open_data_loader(srv.url),
+            decoder=statsbombapi.decoders.DataclassDecoder()
+        )
+        async_client = statsbombapi.AsyncAPIClient(
+            loader=statsbombapi.loaders.AsyncLoader(_open_data_loader(srv.url), max_concurrency=4),
+            decoder=statsbombapi.decoders.DataclassDecoder()
+        )
+        competitions, matches, events, lineups = asyncio.run(fetch_all(async_client))
+        async_client.close()
+
+        assert competitions == sync_client.competitions()
+        assert matches == sync_client.matches(4, 3)
+        assert events == [sync_client.events(m) for m in server.MATCH_IDS]
+        assert lineups == [sync_client.lineups(m) for m in server.MATCH_IDS]
+
+
+class _SlowLoader:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def load_events(self, match_id):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return b'[]'
+
+
+def test_async_loader_concurrency_limit():
+    slow_loader = _SlowLoader()
+    client = statsbombapi.AsyncAPIClient(
+        loader=statsbombapi.loaders.AsyncLoader(slow_loader, max_concurrency=3),
+        decoder=statsbombapi.decoders.JsonDecoder()
+    )
+
+    async def fetch_all():
+        return await asyncio.gather(*[client.events(m) for m in range(20)])
+
+    assert asyncio.run(fetch_all()) == [[]] * 20
+    assert slow_loader.max_active == 3
+    client.close()
+
+
+def _local_client(tmp_path, decoder):
+    for path, body in server.open_data_routes().items():
+        file_path = tmp_path / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(body)
+    return statsbombapi.APIClient(
+        loader=statsbombapi.loaders.LocalLoader(tmp_path, 'json'),
+        decoder=decoder
+    )
+
+
+@pytest.mark.parametrize('decode_workers', [0, 2])
+def test_events_many(tmp_path, decode_workers):
+    client = _local_client(tmp_path, statsbombapi.decoders.DataclassDecoder())
+    match_ids = list(server.MATCH_IDS) + [999]
+
+    results = dict(client.events_many(match_ids, max_workers=2, decode_workers=decode_workers))
+
+    assert results.keys() == set(match_ids)
+    for match_id in server.MATCH_IDS:
+        assert results[match_id] == client.events(match_id)
+    assert isinstance(results[999], FileNotFoundError)
+
+
+def test_events_many_caching_decoder(tmp_path):
+    decoder = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.FastDataclassDecoder(), tmp_path / 'decoded')
+    client = _local_client(tmp_path / 'raw', decoder)
+
+    results = dict(client.events_many(server.MATCH_IDS, max_workers=2, decode_workers=2))
+    for match_id in server.MATCH_IDS:
+        assert results[match_id] == client.events(match_id)
+    # The workers' results were cached
+    assert decoder.misses == 0
+
+
+class _LockingDecoder(statsbombapi.decoders.CompositeDecoder):
+    """ A stateful decoder that can't be pickled. """
+    def __init__(self):
+        super().__init__(statsbombapi.decoders.JsonDecoder())
+        self.lock = threading.Lock()
+
+
+def test_events_many_stateful_decoders(tmp_path):
+    pool = statsbombapi.InternPool()
+    client = _local_client(tmp_path, statsbombapi.decoders.FastDataclassDecoder(intern=pool))
+    results = dict(client.events_many(server.MATCH_IDS, max_workers=2, decode_workers=2))
+    assert results[4321] == client.events(4321)
+
+    client = _local_client(tmp_path, _LockingDecoder())
+    with pytest.warns(RuntimeWarning):
+        results = dict(client.events_many(server.MATCH_IDS, max_workers=2))
+    assert results[4321] == client.events(4321)
+    with pytest.raises(TypeError):
+        client.events_many(server.MATCH_IDS, decode_workers=2)
+
+
+def test_lineups_many(tmp_path):
+    client = _local_client(tmp_path, statsbombapi.decoders.JsonDecoder())
+
+    results = dict(client.lineups_many(server.MATCH_IDS * 10, max_workers=3, decode_workers=0))
+
+    assert results == {match_id: client.lineups(match_id) for match_id in server.MATCH_IDS}
+
+
+@pytest.mark.parametrize('decoder', [
+    statsbombapi.decoders.DataclassDecoder(),
+    statsbombapi.decoders.FastDataclassDecoder(),
+    statsbombapi.decoders.StreamingDataclassDecoder(),
+])
+def test_events_projection(tmp_path, decoder):
+    client = _local_client(tmp_path, decoder)
+    match_id = server.MATCH_IDS[1]
+    events = client.events(match_id)
+
+    passes = client.events(match_id, types=['Pass'])
+    assert passes == [e for e in events if e.type.name == 'Pass']
+    assert client.events(match_id, types=[30, 'Carry']) == [e for e in events if e.type.name in {'Pass', 'Carry'}]
+    assert client.events(match_id, types=[]) == []
+    # A single type
+    assert client.events(match_id, types='Pass') == passes
+    assert client.events(match_id, types=30) == passes
+    with pytest.raises(ValueError):
+        client.events(match_id, types=[30.0])
+
+    projected = client.events(match_id, fields=['pass_', 'location'])
+    assert [e.id for e in projected] == [e.id for e in events]
+    for full, event in zip(events, projected):
+        assert (event.pass_, event.location, event.type) == (full.pass_, full.location, full.type)
+        assert event.player is None and event.carry is None
+
+
+def test_events_projection_json(tmp_path):
+    client = _local_client(tmp_path, statsbombapi.decoders.JsonDecoder())
+    events = client.events(server.MATCH_IDS[1], types=['Pass'], fields=['pass'])
+    assert events and all(e['type']['name'] == 'Pass' for e in events)
+    assert set(events[0]) == statsbombapi.json.project.REQUIRED_KEYS | {'pass'}
+
+    for decoder in [
+        statsbombapi.decoders.UniformDecoder(bytes),
+        statsbombapi.decoders.CompositeDecoder(statsbombapi.decoders.UniformDecoder(bytes)),
+    ]:
+        client.decoder = decoder
+        with pytest.raises(TypeError):
+            client.events(server.MATCH_IDS[1], types=['Pass'])
+
+
+def test_async_loader_across_event_loops():
+    slow_loader = _SlowLoader()
+    client = statsbombapi.AsyncAPIClient(
+        loader=statsbombapi.loaders.AsyncLoader(slow_loader, max_concurrency=1),
+        decoder=statsbombapi.decoders.JsonDecoder()
+    )
+
+    async def fetch_all():
+        return await asyncio.gather(*[client.events(m) for m in range(4)])
+
+    # Each `asyncio.run` has its own event loop
+    assert asyncio.run(fetch_all()) == [[]] * 4
+    assert asyncio.run(fetch_all()) == [[]] * 4
+    assert slow_loader.max_active == 1
+    client.close()
+
+
+@pytest.mark.parametrize('decoder', [
+    statsbombapi.decoders.DataclassDecoder(),
+    statsbombapi.decoders.FastDataclassDecoder(slots=True, intern=True),
+    statsbombapi.decoders.FastDataclassDecoder(lazy_events=True),
+    statsbombapi.decoders.JsonDecoder(),
+])
+def test_iter_events(tmp_path, decoder):
+    client = _local_client(tmp_path, decoder)
+    events = list(client.iter_events(4321))
+    assert events == client.events(4321)
+    assert type(events[0]) is type(client.events(4321)[0])
+
+
+def test_iter_events_unsupported(tmp_path):
+    pytest.importorskip('numpy')
+    client = _local_client(tmp_path, statsbombapi.decoders.EventsFrameDecoder())
+    with pytest.raises(TypeError):
+        client.iter_events(4321)
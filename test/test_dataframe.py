@@ -0,0 +1,81 @@
+"""
+Test decoding responses into flattened pandas DataFrames
+"""
+import datetime
+import json
+import subprocess
+import sys
+
+import pytest
+
+import statsbombapi
+import statsbombapi.dataframe
+import statsbombapi.flatten
+import data
+import server
+
+pd = pytest.importorskip('pandas')
+
+
+def test_events_dataframe():
+    response = data.EVENTS['v5'] + data.MORE_EVENTS['v5']
+    df = statsbombapi.dataframe.dataframe('events', response)
+    events = statsbombapi.parse_events(response)
+
+    assert list(df.columns) == [column.name for column in statsbombapi.flatten.columns('events')]
+    assert len(df) == len(events)
+    assert str(df['type_id'].dtype) == 'Int64'
+    assert str(df['under_pressure'].dtype) == 'boolean'
+    assert df['location_x'].dtype == 'float64'
+    assert df['timestamp'].dtype.kind == 'm'
+
+    for i, event in enumerate(events):
+        assert df['id'][i] == str(event.id)
+        assert df['type_name'][i] == event.type.name
+        t = event.timestamp
+        assert df['timestamp'][i] == pd.Timedelta(hours=t.hour, minutes=t.minute, seconds=t.second,
+                                                  microseconds=t.microsecond)
+        if event.player is None:
+            assert df['player_id'][i] is pd.NA
+        else:
+            assert df['player_id'][i] == event.player.id
+
+    passes = df[df['type_name'] == 'Pass']
+    assert list(passes['pass_end_location_x']) == [61.0]
+    assert passes['pass_height_name'].iloc[0] == 'Ground Pass'
+    shot = df[df['type_id'] == 16].iloc[0]
+    assert shot['shot_statsbomb_xg'] == pytest.approx(0.12)
+    assert shot['shot_end_location_z'] == pytest.approx(1.1)
+    assert len(json.loads(shot['shot_freeze_frame'])) == 2
+    assert df['shot_statsbomb_xg'].isna().sum() == len(df) - 1
+
+    assert statsbombapi.dataframe.dataframe('events', []).shape == (0, len(df.columns))
+
+
+def test_matches_dataframe():
+    df = statsbombapi.dataframe.dataframe('matches', data.MATCHES['v3'])
+    assert list(df['home_team_name']) == ['Warwick Wanderers', 'Warwick Wanderers']
+    assert df['match_date'][1] == pd.Timestamp(datetime.date(655, 10, 15))
+    assert df['kick_off'][1] == pd.Timedelta(hours=18)
+    assert df['match_status'].dtype == 'category'
+    assert df['home_score'].isna().tolist() == [True, False]
+
+
+def test_dataframe_decoder():
+    with server.serve() as srv:
+        with pytest.warns(UserWarning):
+            loader = statsbombapi.loaders.OpenDataLoader(base_url=srv.url)
+        client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.DataFrameDecoder())
+
+        lineups = client.lineups(4321)
+        assert set(lineups['team_id']) == {team['team_id'] for team in data.LINEUPS['v2']}
+        assert len(client.competitions()) == len(data.COMPETITIONS['v2'])
+        events = client.events(4321)
+        assert len(events) == len(data.EVENTS['v5'])
+        assert len(client.events(4321, types=['Pass'])) == (events['type_name'] == 'Pass').sum()
+
+
+def test_import_without_pandas():
+    # pandas is slow to import, so is only imported when decoding DataFrames
+    code = 'import sys, statsbombapi; assert "pandas" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
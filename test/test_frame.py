@@ -0,0 +1,116 @@
+"""
+Test the columnar EventsFrame decoder
+"""
+import json
+import math
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+import statsbombapi
+import statsbombapi.frame
+import data
+import server
+
+np = pytest.importorskip('numpy')
+
+
+def _response():
+    return data.EVENTS['v5'] + data.MORE_EVENTS['v5']
+
+
+def test_events_frame():
+    response = _response()
+    frame = statsbombapi.frame.events_frame(response)
+    events = statsbombapi.parse_events(response)
+
+    assert len(frame) == len(events)
+    assert frame.columns.keys() == statsbombapi.frame.COLUMNS.keys()
+    for name, dtype in statsbombapi.frame.COLUMNS.items():
+        assert frame[name].dtype == np.dtype(dtype)
+
+    for i, event in enumerate(events):
+        assert frame.id[i] == str(event.id)
+        assert (frame.index[i], frame.period[i], frame.minute[i], frame.second[i]) == \
+            (event.index, event.period, event.minute, event.second)
+        t = event.timestamp
+        assert frame.timestamp[i] == pytest.approx(t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6)
+        assert frame.type_id[i] == event.type.id
+        assert frame.team_id[i] == event.team.id
+        assert frame.player_id[i] == (event.player.id if event.player else statsbombapi.frame.MISSING_ID)
+        if event.location:
+            assert (frame.location_x[i], frame.location_y[i]) == tuple(event.location[:2])
+        else:
+            assert math.isnan(frame.location_x[i])
+        if event.duration is None:
+            assert math.isnan(frame.duration[i])
+
+    assert frame.categories['type'][16] == 'Shot'
+    assert list(frame.names('player')[:2]) == [None, 'Player X']
+
+    shots = frame.select(frame.type_id == 16)
+    assert len(shots) == 1
+    assert (shots.end_location_x[0], shots.end_location_y[0]) == (120.0, 38.2)
+    assert np.isnan(frame.end_location_x[frame.type_id == 18]).all()
+
+
+def test_events_frame_concat():
+    frame = statsbombapi.frame.events_frame(data.EVENTS['v5'])
+    more = statsbombapi.frame.events_frame(data.MORE_EVENTS['v5'])
+    both = statsbombapi.frame.EventsFrame.concat([frame, more])
+    assert len(both) == len(frame) + len(more)
+    assert both.categories['type'].keys() == frame.categories['type'].keys() | more.categories['type'].keys()
+    assert len(statsbombapi.frame.EventsFrame.concat([])) == 0
+
+    unpickled = pickle.loads(pickle.dumps(both))
+    assert (unpickled.index == both.index).all()
+
+
+def test_events_frame_decoder():
+    with server.serve() as srv:
+        with pytest.warns(UserWarning):
+            loader = statsbombapi.loaders.OpenDataLoader(base_url=srv.url)
+        client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.EventsFrameDecoder())
+
+        frame = client.events(4321)
+        assert isinstance(frame, statsbombapi.frame.EventsFrame)
+        assert len(frame) == len(json.loads(srv.routes['events/4321.json']))
+        assert len(client.events(4321, types=['Pass'])) == (frame.type_id == 30).sum()
+        # Selecting by a type id taken from the frame (a NumPy integer)
+        type_id = frame.type_id[1]
+        assert isinstance(type_id, np.integer)
+        assert len(client.events(4321, types=[type_id])) == (frame.type_id == type_id).sum() > 0
+        assert client.matches(4, 3) == statsbombapi.parse_matches(json.loads(srv.routes['matches/4/3.json']))
+
+
+def test_freeze_frames():
+    shot = next(e for e in data.MORE_EVENTS['v5'] if e['type']['id'] == 16)
+    # A penalty (with no freeze frame), and a shot with a truncated freeze frame
+    penalty = dict(shot, id='0e7c6b6d-6f7a-4fbb-9c53-2a3c0f1f2d11', shot={'statsbomb_xg': 0.76})
+    crowded = dict(shot, shot=dict(shot['shot'], freeze_frame=shot['shot']['freeze_frame'] * 2))
+
+    frames = statsbombapi.frame.freeze_frames([data.EVENTS['v5'] + [penalty], [shot, crowded]])
+    assert len(frames) == 3
+    assert list(frames.shot_id) == [penalty['id'], shot['id'], shot['id']]
+    assert frames.features.shape == (3, 4, len(statsbombapi.frame.FREEZE_FRAME_FEATURES))
+    assert frames.mask.sum(axis=1).tolist() == [0, 2, 4]
+
+    keeper, teammate = shot['shot']['freeze_frame']
+    assert frames.features[1, :2].tolist() == [
+        [pytest.approx(118.5), pytest.approx(40.0), 0.0, 1.0],
+        [pytest.approx(104.0), pytest.approx(30.2), 1.0, 19.0],
+    ]
+    assert frames.player_id[1].tolist() == [keeper['player']['id'], teammate['player']['id'], -1, -1]
+    assert (frames.features[~frames.mask] == 0).all()
+
+    truncated = statsbombapi.frame.freeze_frames([[shot, crowded]], max_players=3)
+    assert truncated.mask.sum(axis=1).tolist() == [2, 3]
+    assert len(statsbombapi.frame.freeze_frames([data.EVENTS['v5']])) == 0
+
+
+def test_import_without_numpy():
+    # numpy is only imported when decoding frames
+    code = 'import sys, statsbombapi; assert "numpy" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -1,13 +1,23 @@
 """
 Test the parsing of (mocked) data from statsbomb API routes
 """
+import concurrent.futures
+import dataclasses
 import datetime
+import io
+import json
+import pickle
+import time
 import uuid
 
 import hypothesis
 import hypothesis.strategies as st
+import marshmallow
+import pytest
 
+import statsbombapi.decoders
 import statsbombapi.json as sb_json
+import statsbombapi.json.codegen
 import data
 
 
@@ -399,3 +409,304 @@ def test_events():
     for version in ['v5']:
         parsed = sb_json.parse_events(data.EVENTS[version])
         assert events == list(parsed)
+
+
+def _split(s, sizes):
+    chunks, start = [], 0
+    for size in sizes:
+        chunks.append(s[start:start + size])
+        start += size
+    return chunks + [s[start:]]
+
+
+@hypothesis.given(st.lists(st.integers(min_value=1, max_value=64), max_size=200))
+def test_iter_array_chunks(sizes):
+    for route in [data.COMPETITIONS['v2'], data.MATCHES['v3'], data.LINEUPS['v2'], data.EVENTS['v5']]:
+        raw = json.dumps(route, indent=1, ensure_ascii=False).encode('utf8')
+        assert list(sb_json.iter_array(_split(raw, sizes))) == route
+
+
+def test_iter_array():
+    assert list(sb_json.iter_array(b' [ ] ')) == []
+    assert list(sb_json.iter_array([b'[1', b'23, 4', b'5.5]'])) == [123, 45.5]
+    # Numbers split at a chunk boundary
+    assert list(sb_json.iter_array([b'[1.', b'5]'])) == [1.5]
+    assert list(sb_json.iter_array([b'[1.5e', b'3]'])) == [1500.0]
+    assert list(sb_json.iter_array([b'[-', b'2E', b'-', b'1, 1', b'0]'])) == [-0.2, 10]
+    assert list(sb_json.iter_array(io.BytesIO(b'[{"a": [1, 2]}, "b"]'), chunk_size=3)) == [{'a': [1, 2]}, 'b']
+
+    for invalid in [b'', b'{}', b'[1, 2', b'[1 2]', b'[1,]', b'[1] 2', b'[{"a": 1]']:
+        with pytest.raises(json.JSONDecodeError):
+            list(sb_json.iter_array([invalid[:2], invalid[2:]]))
+
+
+def test_schema_cache(monkeypatch):
+    sb_json.warmup()
+    assert sb_json.parse.schema(sb_json.Event) is sb_json.parse.schema(sb_json.Event)
+
+    # Nothing is built when decoding after warming up
+    schemas_built = []
+    schema_init = marshmallow.Schema.__init__
+
+    def counting_init(self, *args, **kwargs):
+        schemas_built.append(type(self))
+        schema_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(marshmallow.Schema, '__init__', counting_init)
+    decoders = sb_json.codegen.decoder.cache_info().currsize
+    for responses, parse_route, codegen_route in [
+        (data.COMPETITIONS, sb_json.parse_competitions, sb_json.codegen.parse_competitions),
+        (data.MATCHES, sb_json.parse_matches, sb_json.codegen.parse_matches),
+        (data.LINEUPS, sb_json.parse_lineups, sb_json.codegen.parse_lineups),
+        (data.EVENTS, sb_json.parse_events, sb_json.codegen.parse_events),
+        (data.MORE_EVENTS, sb_json.parse_events, sb_json.codegen.parse_events),
+    ]:
+        for response in responses.values():
+            parse_route(response)
+            codegen_route(response)
+            codegen_route(response, slots=True)
+    list(sb_json.parse_events_iter(json.dumps(data.EVENTS['v5']).encode('utf8')))
+    assert schemas_built == []
+    assert sb_json.codegen.decoder.cache_info().currsize == decoders
+
+
+@pytest.mark.parametrize('route, responses', [
+    ('competitions', data.COMPETITIONS),
+    ('matches', data.MATCHES),
+    ('lineups', data.LINEUPS),
+    ('events', data.EVENTS),
+    ('events', data.MORE_EVENTS),
+])
+def test_codegen(route, responses):
+    for response in responses.values():
+        expected = getattr(sb_json, f'parse_{route}')(response)
+        parsed = getattr(sb_json.codegen, f'parse_{route}')(response)
+        assert parsed == expected
+        assert repr(parsed) == repr(expected)
+
+
+def test_codegen_defaults():
+    event = dict(data.EVENTS['v5'][2])
+    del event['related_events']
+    parsed = sb_json.codegen.decoder(sb_json.Event)(event)
+    assert parsed.related_events == []
+    assert parsed.pass_ is None
+    with pytest.raises(KeyError):
+        sb_json.codegen.decoder(sb_json.Event)({'id': event['id']})
+
+
+@pytest.mark.parametrize('backend', list(statsbombapi.decoders.JSON_BACKENDS))
+def test_json_backends(backend):
+    if backend not in statsbombapi.decoders.available_json_backends():
+        pytest.skip(f'{backend} is not installed')
+    decoder = statsbombapi.decoders.JsonDecoder(backend)
+    for responses in [data.COMPETITIONS, data.MATCHES, data.LINEUPS, data.EVENTS, data.MORE_EVENTS]:
+        for response in responses.values():
+            raw = json.dumps(response).encode('utf8')
+            for s in [raw, raw.decode('utf8'), memoryview(raw)]:
+                decoded = decoder.decode_events(s)
+                assert decoded == response
+                assert repr(decoded) == repr(response)
+
+
+def test_json_backend_unknown():
+    with pytest.raises(ValueError):
+        statsbombapi.decoders.JsonDecoder('yaml')
+
+
+def test_lazy_events():
+    for responses in [data.EVENTS, data.MORE_EVENTS]:
+        for response in responses.values():
+            lazy = sb_json.lazy.parse_events(response)
+            assert all('pass_' not in event.__dict__ for event in lazy)
+            assert lazy == sb_json.parse_events(response)
+            assert sb_json.parse_events(response) == lazy
+
+    event = sb_json.LazyEvent(data.MORE_EVENTS['v5'][1])
+    assert isinstance(event, sb_json.Event)
+    assert event.shot.freeze_frame[1].player.name == 'Player Y'
+    assert event.shot is event.shot
+    assert event.pass_ is None
+    assert list(sb_json.extract(sb_json.Position, event)) == [
+        sb_json.Position(id=23, name='Center Forward'),
+        sb_json.Position(id=1, name='Goalkeeper'),
+        sb_json.Position(id=19, name='Center Attacking Midfield'),
+    ]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        event.shot = None
+
+
+def test_parse_events_iter():
+    for responses in [data.EVENTS, data.MORE_EVENTS]:
+        for response in responses.values():
+            raw = json.dumps(response).encode('utf8')
+            events = sb_json.parse_events_iter(_split(raw, [7] * (len(raw) // 7)))
+            assert not isinstance(events, list)
+            assert list(events) == sb_json.parse_events(response)
+            assert list(sb_json.parse_events_iter(memoryview(raw))) == sb_json.parse_events(response)
+
+
+def test_intern_pool():
+    pool = sb_json.InternPool()
+    response = data.EVENTS['v5'] + data.MORE_EVENTS['v5']
+    events = sb_json.codegen.parse_events(response, pool)
+    assert events == sb_json.parse_events(response)
+
+    teams = {id(event.team) for event in events if event.team.id == 966}
+    assert len(teams) == 1
+    assert events[0].possession_team is events[0].team
+
+    stats = pool.stats()
+    assert stats.hits > 0 and stats.misses == len(pool)
+    assert stats.bytes_saved > 0
+    assert 0 < stats.hit_rate < 1
+
+    # Shared across responses
+    again = sb_json.codegen.parse_events(response, pool)
+    assert again[0].team is events[0].team
+    assert pool.stats().misses == stats.misses
+
+    pool.clear()
+    assert len(pool) == 0 and pool.stats().hits == 0
+
+
+def test_intern_pool_threads():
+    response = data.EVENTS['v5'] + data.MORE_EVENTS['v5']
+    serial = sb_json.InternPool()
+    sb_json.codegen.parse_events(response, serial)
+    lookups = serial.hits + serial.misses
+
+    pool = sb_json.InternPool()
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: sb_json.codegen.parse_events(response, pool), range(64)))
+    assert all(events[0].team is results[0][0].team for events in results)
+    assert (pool.hits + pool.misses, pool.misses) == (64 * lookups, len(pool))
+
+
+def test_codegen_threads(monkeypatch):
+    # Generate the decoders afresh, slowly, on several threads at once
+    monkeypatch.setattr(sb_json.codegen, '_module', sb_json.codegen._Module())
+    monkeypatch.setattr(sb_json.codegen, '_slotted_module', sb_json.codegen._Module(sb_json.slotted.variant))
+
+    def slow_exec(source, namespace):
+        time.sleep(0.01)
+        exec(source, namespace)
+
+    monkeypatch.setattr(sb_json.codegen, 'exec', slow_exec, raising=False)
+    sb_json.codegen.decoder.cache_clear()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: sb_json.codegen.parse_events(data.EVENTS['v5']), range(8)))
+    finally:
+        sb_json.codegen.decoder.cache_clear()
+    assert all(events == sb_json.parse_events(data.EVENTS['v5']) for events in results)
+
+
+def test_intern_pool_types():
+    pool = sb_json.InternPool(types=[sb_json.EventType])
+    events = sb_json.codegen.parse_events(data.EVENTS['v5'] * 2, pool)
+    assert events[0].type is events[len(data.EVENTS['v5'])].type
+    assert events[0].team is not events[len(data.EVENTS['v5'])].team
+
+
+def _walk_dataclasses(obj):
+    if isinstance(obj, list):
+        for o in obj:
+            yield from _walk_dataclasses(o)
+    elif dataclasses.is_dataclass(obj):
+        yield obj
+        for field in dataclasses.fields(obj):
+            yield from _walk_dataclasses(getattr(obj, field.name))
+
+
+@pytest.mark.parametrize('route, responses', [
+    ('competitions', data.COMPETITIONS),
+    ('matches', data.MATCHES),
+    ('lineups', data.LINEUPS),
+    ('events', data.EVENTS),
+    ('events', data.MORE_EVENTS),
+])
+def test_slotted(route, responses):
+    for response in responses.values():
+        expected = getattr(sb_json, f'parse_{route}')(response)
+        parsed = getattr(sb_json.codegen, f'parse_{route}')(response, slots=True)
+        assert repr(parsed) == repr(expected)
+        objs = list(_walk_dataclasses(parsed))
+        assert objs
+        for obj in objs:
+            assert not hasattr(obj, '__dict__')
+            assert type(obj) is sb_json.slotted.variant(sb_json.slotted.original(type(obj)))
+        assert pickle.loads(pickle.dumps(parsed)) == parsed
+
+
+def test_slotted_semantics():
+    lineups = sb_json.codegen.parse_lineups(data.LINEUPS['v2'], slots=True)
+    # __post_init__ derivations build slotted instances too
+    assert type(lineups[0].team) is sb_json.slotted.Team
+    assert type(lineups[0].lineup[0].player) is sb_json.slotted.Player
+    assert set(sb_json.extract(sb_json.Team, lineups)) == {lineup.team for lineup in lineups}
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        lineups[0].team_id = 1
+
+    pool = sb_json.InternPool()
+    events = sb_json.codegen.parse_events(data.EVENTS['v5'], pool, slots=True)
+    assert events[1].team is events[2].team
+
+
+def _same_result(f, g, x):
+    try:
+        expected = g(x)
+    except (ValueError, TypeError) as e:
+        with pytest.raises(type(e)):
+            f(x)
+    else:
+        assert f(x) == expected
+        assert repr(f(x)) == repr(expected)
+
+
+_TIME_TEXT = st.one_of(
+    st.times().map(lambda t: t.strftime('%H:%M:%S.%f')[:-3]),
+    st.from_regex(r'\A[0-9:.]{1,14}\Z'),
+    st.text(max_size=14),
+)
+
+
+@hypothesis.given(_TIME_TEXT)
+def test_parse_time(s):
+    def strptime(x):
+        return datetime.datetime.strptime(x, '%H:%M:%S.%f').time()
+
+    _same_result(sb_json.convert.parse_time, strptime, s)
+    _same_result(sb_json.convert.parse_time_cached, strptime, s)
+
+
+@hypothesis.given(st.one_of(
+    st.dates().map(str),
+    st.from_regex(r'\A[0-9-]{1,12}\Z'),
+    st.text(max_size=12),
+))
+def test_parse_date(s):
+    def strptime(x):
+        return datetime.datetime.strptime(x, '%Y-%m-%d').date()
+
+    _same_result(sb_json.convert.parse_date, strptime, s)
+    _same_result(sb_json.convert.parse_date_cached, strptime, s)
+
+
+@hypothesis.given(st.one_of(
+    st.uuids().map(str),
+    st.uuids().map(lambda u: str(u).upper()),
+    st.from_regex(r'\A[0-9a-fA-F_+ {}-]{30,40}\Z'),
+    st.text(max_size=40),
+))
+def test_parse_uuid(s):
+    _same_result(sb_json.convert.parse_uuid, uuid.UUID, s)
+
+
+def test_parse_uuid_attributes():
+    s = data.EVENTS['v5'][0]['id']
+    parsed = sb_json.convert.parse_uuid(s)
+    assert type(parsed) is uuid.UUID
+    assert (parsed.int, parsed.is_safe, hash(parsed)) == (uuid.UUID(s).int, uuid.UUID(s).is_safe, hash(uuid.UUID(s)))
+    assert pickle.loads(pickle.dumps(parsed)) == parsed
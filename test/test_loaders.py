@@ -0,0 +1,292 @@
+"""
+Test the loaders, using a local stand-in HTTP server where needed
+"""
+import concurrent.futures
+import datetime
+import json
+import os
+import pickle
+
+import pytest
+
+import statsbombapi
+import statsbombapi.storage
+import data
+import server
+
+
+def test_http_fetcher_reuses_connections():
+    with server.serve() as srv, statsbombapi.loaders.HTTPFetcher(srv.url) as fetcher:
+        for _ in range(10):
+            assert fetcher.get('competitions.json') == srv.routes['competitions.json']
+
+        stats = fetcher.stats()
+        assert stats.requests == 10
+        assert stats.connections == 1
+        assert stats.reused == 9
+        assert srv.connections == 1
+
+
+def test_http_fetcher_threads_share_pool():
+    paths = [f'events/{match_id}.json' for match_id in server.MATCH_IDS] * 20
+
+    with server.serve() as srv, statsbombapi.loaders.HTTPFetcher(srv.url, pool_maxsize=4) as fetcher:
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            bodies = list(pool.map(fetcher.get, paths))
+
+        assert bodies == [srv.routes[p] for p in paths]
+        assert fetcher.stats().requests == len(paths)
+        assert fetcher.stats().connections <= 4
+
+
+def test_http_fetcher_error_code():
+    with server.serve() as srv, statsbombapi.loaders.HTTPFetcher(srv.url) as fetcher:
+        with pytest.raises(statsbombapi.StatsbombAPIException):
+            fetcher.get('events/1.json')
+
+
+def test_open_data_loader():
+    with server.serve() as srv:
+        with pytest.warns(UserWarning):
+            loader = statsbombapi.loaders.OpenDataLoader(base_url=srv.url)
+        assert loader.load_competitions() == srv.routes['competitions.json']
+        assert loader.load_matches(4, 3) == srv.routes['matches/4/3.json']
+        assert loader.load_events(1234) == srv.routes['events/1234.json']
+        assert loader.connection_stats().reused == 2
+        loader.close()
+
+
+class _CountingLoader:
+    def __init__(self):
+        self.calls = []
+        self.routes = server.open_data_routes()
+
+    def load_competitions(self):
+        self.calls.append('competitions')
+        return self.routes['competitions.json']
+
+    def load_matches(self, competition_id, season_id):
+        self.calls.append(('matches', competition_id, season_id))
+        return self.routes[f'matches/{competition_id}/{season_id}.json']
+
+    def load_lineups(self, match_id):
+        self.calls.append(('lineups', match_id))
+        return self.routes[f'lineups/{match_id}.json']
+
+    def load_events(self, match_id):
+        self.calls.append(('events', match_id))
+        return self.routes[f'events/{match_id}.json']
+
+
+def test_caching_loader(tmp_path):
+    upstream = _CountingLoader()
+    loader = statsbombapi.loaders.CachingLoader(upstream, tmp_path)
+
+    for _ in range(3):
+        assert loader.load_competitions() == upstream.routes['competitions.json']
+        assert loader.load_matches(4, 3) == upstream.routes['matches/4/3.json']
+        assert loader.load_events(1234) == upstream.routes['events/1234.json']
+    assert upstream.calls == ['competitions', ('matches', 4, 3), ('events', 1234)]
+    assert (loader.hits, loader.misses) == (6, 3)
+
+    # The cache persists between loaders, and can be read with LocalLoader
+    loader = statsbombapi.loaders.CachingLoader(upstream, tmp_path)
+    assert loader.load_events(1234) == upstream.routes['events/1234.json']
+    assert len(upstream.calls) == 3
+    assert statsbombapi.loaders.LocalLoader(tmp_path, 'json').load_matches(4, 3) == upstream.routes['matches/4/3.json']
+
+
+def test_caching_loader_ttl(tmp_path):
+    upstream = _CountingLoader()
+    loader = statsbombapi.loaders.CachingLoader(
+        upstream, tmp_path, ttl={'competitions': datetime.timedelta(0)}
+    )
+
+    loader.load_competitions()
+    loader.load_competitions()
+    loader.load_lineups(1234)
+    loader.load_lineups(1234)
+    assert upstream.calls == ['competitions', 'competitions', ('lineups', 1234)]
+
+
+def test_caching_loader_eviction(tmp_path):
+    upstream = _CountingLoader()
+    event_size = len(upstream.routes['events/1234.json'])
+    loader = statsbombapi.loaders.CachingLoader(upstream, tmp_path, max_bytes=event_size * 1.5)
+
+    loader.load_events(1234)
+    loader.load_events(4321)
+    assert loader.cache_size() == event_size
+    assert not (tmp_path / 'events' / '1234.json').exists()
+
+    loader.load_events(4321)
+    loader.load_events(1234)
+    assert upstream.calls == [('events', 1234), ('events', 4321), ('events', 1234)]
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_local_loader_compression(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    routes = server.open_data_routes()
+    compressed = statsbombapi.storage.compress(routes['events/1234.json'], compression)
+
+    # Detected by extension...
+    (tmp_path / 'events').mkdir()
+    (tmp_path / 'events' / f'1234.json.{statsbombapi.storage.COMPRESSION_EXTENSIONS[compression]}').write_bytes(compressed)
+    # ...or by magic number
+    (tmp_path / 'events' / '4321.json').write_bytes(compressed)
+
+    loader = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    assert loader.load_events(1234) == routes['events/1234.json']
+    assert loader.load_events(4321) == routes['events/1234.json']
+    with pytest.raises(FileNotFoundError):
+        loader.load_events(1)
+
+
+def test_local_loader_mixed_compression(tmp_path):
+    routes = server.open_data_routes()
+    old, new = routes['events/1234.json'], json.dumps(data.MORE_EVENTS['v5']).encode('utf8')
+    plain = tmp_path / 'events' / '1234.json'
+    compressed = tmp_path / 'events' / '1234.json.gz'
+    plain.parent.mkdir()
+    plain.write_bytes(old)
+    compressed.write_bytes(statsbombapi.storage.compress(new, 'gzip'))
+
+    # A stale uncompressed copy doesn't hide a newer compressed one...
+    os.utime(plain, (1_000_000, 1_000_000))
+    loader = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    assert loader.load_events(1234) == new
+    # ...or vice versa
+    os.utime(compressed, (500_000, 500_000))
+    assert loader.load_events(1234) == old
+
+
+def test_caching_loader_compression(tmp_path):
+    upstream = _CountingLoader()
+    loader = statsbombapi.loaders.CachingLoader(upstream, tmp_path, compression='gzip')
+
+    assert loader.load_events(1234) == upstream.routes['events/1234.json']
+    assert loader.load_events(1234) == upstream.routes['events/1234.json']
+    assert loader.cache_size() == (tmp_path / 'events' / '1234.json.gz').stat().st_size
+    assert loader.cache_size() < len(upstream.routes['events/1234.json'])
+    assert statsbombapi.loaders.LocalLoader(tmp_path, 'json').load_events(1234) == upstream.routes['events/1234.json']
+    assert upstream.calls == [('events', 1234)]
+
+
+def test_caching_decoder(tmp_path):
+    raw = json.dumps(data.EVENTS['v5']).encode('utf8')
+    decoder = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.FastDataclassDecoder(slots=True), tmp_path)
+    expected = statsbombapi.decoders.FastDataclassDecoder(slots=True).decode_events(raw)
+
+    assert decoder.decode_events(raw) == expected
+    assert decoder.decode_events(memoryview(raw)) == expected
+    assert (decoder.hits, decoder.misses) == (1, 1)
+    assert decoder.project_events(raw, statsbombapi.json.project.EventProjection(['Pass'])) == [
+        e for e in expected if e.type.name == 'Pass'
+    ]
+    assert decoder.misses == 2
+
+    # The cache persists, but is keyed by decoder and response
+    decoder = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.FastDataclassDecoder(slots=True), tmp_path)
+    assert decoder.decode_events(raw) == expected
+    lineups = json.dumps(data.LINEUPS['v2'])
+    assert decoder.decode_lineups(lineups) == statsbombapi.decoders.FastDataclassDecoder(slots=True).decode_lineups(lineups)
+    assert (decoder.hits, decoder.misses) == (1, 1)
+    other = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.FastDataclassDecoder(), tmp_path)
+    assert other.decode_events(raw) == statsbombapi.parse_events(data.EVENTS['v5'])
+    assert other.misses == 1
+
+    # Streamed responses aren't cached
+    size = other.cache_size()
+    assert size == sum(p.stat().st_size for p in tmp_path.rglob('*.pickle'))
+    streaming = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.StreamingDataclassDecoder(), tmp_path)
+    assert streaming.decode_events(iter([raw])) == statsbombapi.parse_events(data.EVENTS['v5'])
+    assert streaming.cache_size() == size
+
+
+def test_caching_decoder_eviction(tmp_path):
+    decoder = statsbombapi.decoders.CachingDecoder(
+        statsbombapi.decoders.FastDataclassDecoder(), tmp_path, max_bytes=1, compression='gzip'
+    )
+    for response in (data.EVENTS['v5'], data.MORE_EVENTS['v5']):
+        decoder.decode_events(json.dumps(response).encode('utf8'))
+    assert len(list(tmp_path.rglob('*.pickle.gz'))) == 1
+
+
+def test_caching_decoder_pickle(tmp_path):
+    raw = json.dumps(data.EVENTS['v5']).encode('utf8')
+    decoder = statsbombapi.decoders.CachingDecoder(statsbombapi.decoders.FastDataclassDecoder(), tmp_path)
+    decoder.decode_events(raw)
+
+    # e.g. to decode on a process pool
+    unpickled = pickle.loads(pickle.dumps(decoder.decode_events))
+    assert unpickled(raw) == statsbombapi.parse_events(data.EVENTS['v5'])
+    assert unpickled.__self__.hits == 1
+
+
+def test_pack_loader(tmp_path):
+    upstream = _CountingLoader()
+    upstream.routes['competitions.json'] = json.dumps([{'competition_id': 4, 'season_id': 3}]).encode('utf8')
+    statsbombapi.pack.write_pack(tmp_path / '4' / '3.sbpack', upstream, 4, 3)
+    # Only available matches have lineups and events
+    assert ('events', 1234) not in upstream.calls
+
+    loader = statsbombapi.loaders.PackLoader(tmp_path)
+    assert json.loads(loader.load_competitions()) == [{'competition_id': 4, 'season_id': 3}]
+    assert loader.load_matches(4, 3) == upstream.routes['matches/4/3.json']
+    assert loader.load_lineups(4321) == upstream.routes['lineups/4321.json']
+    assert isinstance(loader.load_events(4321), memoryview)
+    with pytest.raises(FileNotFoundError):
+        loader.load_events(1234)
+
+    client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.DataclassDecoder())
+    assert client.events(4321) == statsbombapi.parse_events(json.loads(upstream.routes['events/4321.json']))
+
+    # Seasons must be listed in the competitions, to write their record in the pack
+    with pytest.raises(ValueError):
+        statsbombapi.pack.write_pack(tmp_path / '4' / '4.sbpack', upstream, 4, 4)
+    assert not (tmp_path / '4' / '4.sbpack').exists()
+
+
+def test_pack_format_error(tmp_path):
+    (tmp_path / 'bad.sbpack').write_bytes(b'not a pack file at all')
+    with pytest.raises(statsbombapi.pack.PackFormatError):
+        statsbombapi.loaders.PackLoader(tmp_path)
+
+
+def test_local_loader_mmap(tmp_path):
+    routes = server.open_data_routes()
+    (tmp_path / 'events').mkdir()
+    (tmp_path / 'events' / '1234.json').write_bytes(routes['events/1234.json'])
+    (tmp_path / 'events' / '4321.json.gz').write_bytes(statsbombapi.storage.compress(routes['events/4321.json'], 'gzip'))
+    (tmp_path / 'events' / '1.json').write_bytes(b'')
+
+    loader = statsbombapi.loaders.LocalLoader(tmp_path, 'json', mmap=True)
+    content = loader.load_events(1234)
+    assert isinstance(content, memoryview)
+    assert content == routes['events/1234.json']
+    assert loader.load_events(4321) == routes['events/4321.json']
+    assert loader.load_events(1) == b''
+
+    client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.DataclassDecoder())
+    assert client.events(1234) == statsbombapi.parse_events(json.loads(routes['events/1234.json']))
+
+
+def test_streaming_loader():
+    with server.serve() as srv:
+        with pytest.warns(UserWarning):
+            loader = statsbombapi.loaders.OpenDataLoader(base_url=srv.url, stream=True)
+        chunks = loader.load_events(1234)
+        assert not isinstance(chunks, bytes)
+        assert b''.join(chunks) == srv.routes['events/1234.json']
+
+        client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.StreamingDataclassDecoder())
+        assert client.events(4321) == statsbombapi.parse_events(json.loads(srv.routes['events/4321.json']))
+        assert client.matches(4, 3) == statsbombapi.parse_matches(json.loads(srv.routes['matches/4/3.json']))
+        assert list(client.iter_events(4321)) == client.events(4321)
+
+        with pytest.raises(statsbombapi.StatsbombAPIException):
+            loader.load_events(1)
+        # Every response has been returned to the pool
+        assert loader.connection_stats().connections == 1
@@ -0,0 +1,52 @@
+"""
+Test decoding responses on a pool of processes
+"""
+import json
+
+import pytest
+
+import statsbombapi
+import statsbombapi.frame
+import statsbombapi.parallel
+import data
+
+
+def _payloads():
+    return {
+        1234: json.dumps(data.EVENTS['v5']).encode('utf8'),
+        4321: memoryview(json.dumps(data.MORE_EVENTS['v5']).encode('utf8')),
+    }
+
+
+def test_parallel_events_frame():
+    np = pytest.importorskip('numpy')
+    with statsbombapi.parallel.ParallelDecoder(max_workers=2) as decoder:
+        frame = decoder.events(_payloads())
+
+    expected = statsbombapi.frame.EventsFrame.concat([
+        statsbombapi.frame.events_frame(data.EVENTS['v5']),
+        statsbombapi.frame.events_frame(data.MORE_EVENTS['v5']),
+    ])
+    assert len(frame) == len(expected)
+    assert (frame.index == expected.index).all()
+    assert frame.categories == expected.categories
+    assert frame.match_id.tolist() == [1234] * len(data.EVENTS['v5']) + [4321] * len(data.MORE_EVENTS['v5'])
+    assert (frame.select(frame.type_id == 16).match_id == 4321).all()
+    assert statsbombapi.frame.EventsFrame.concat([frame]).match_id.dtype == np.int64
+
+
+def test_parallel_arrow_and_dataclasses():
+    pytest.importorskip('pyarrow')
+    with statsbombapi.parallel.ParallelDecoder(statsbombapi.decoders.ArrowDecoder(), max_workers=2) as decoder:
+        table = decoder.events(_payloads())
+        lineups = decoder.lineups({4321: json.dumps(data.LINEUPS['v2']).encode('utf8')})
+    assert table.column('match_id').to_pylist()[-1] == 4321
+    assert table.num_rows == len(data.EVENTS['v5']) + len(data.MORE_EVENTS['v5'])
+    assert set(lineups.column('match_id').to_pylist()) == {4321}
+
+    with statsbombapi.parallel.ParallelDecoder(statsbombapi.decoders.FastDataclassDecoder(), max_workers=2) as decoder:
+        events = decoder.events(_payloads())
+    assert events == {
+        1234: statsbombapi.parse_events(data.EVENTS['v5']),
+        4321: statsbombapi.parse_events(data.MORE_EVENTS['v5']),
+    }
@@ -0,0 +1,101 @@
+"""
+Test flattening responses into Arrow tables and Parquet datasets
+"""
+import datetime
+import json
+import subprocess
+import sys
+
+import pytest
+
+import statsbombapi
+import statsbombapi.arrow
+import statsbombapi.flatten
+import statsbombapi.parquet
+import data
+import server
+
+pa = pytest.importorskip('pyarrow')
+
+
+def _events():
+    return data.EVENTS['v5'] + data.MORE_EVENTS['v5']
+
+
+def test_columns():
+    names = [column.name for column in statsbombapi.flatten.columns('events')]
+    assert len(names) == len(set(names))
+    for name in ('type_name', 'location_x', 'pass_end_location_x', 'shot_end_location_z',
+                 'shot_statsbomb_xg', 'fifty_fifty_outcome_name', 'shot_freeze_frame'):
+        assert name in names
+
+    names = [column.name for column in statsbombapi.flatten.columns('lineups')]
+    assert names[:4] == ['team_id', 'team_name', 'player_id', 'player_name']
+    assert 'home_team_name' in [column.name for column in statsbombapi.flatten.columns('matches')]
+
+
+def test_events_table():
+    response = _events()
+    table = statsbombapi.arrow.table('events', response)
+    events = statsbombapi.parse_events(response)
+
+    assert table.num_rows == len(events)
+    assert table.schema == statsbombapi.arrow.schema('events')
+    rows = table.to_pylist()
+    for row, event in zip(rows, events):
+        assert row['id'] == str(event.id)
+        assert row['timestamp'] == event.timestamp
+        assert row['type_id'] == event.type.id
+        assert row['player_name'] == (event.player.name if event.player else None)
+        assert row['pass_end_location_x'] == (event.pass_.end_location[0] if event.pass_ else None)
+
+    shot, = [row for row in rows if row['type_name'] == 'Shot']
+    assert (shot['shot_end_location_x'], shot['shot_end_location_z']) == (120.0, 1.1)
+    assert shot['shot_statsbomb_xg'] == pytest.approx(0.12)
+    assert len(json.loads(shot['shot_freeze_frame'])) == 2
+    assert rows[0]['shot_statsbomb_xg'] is None
+
+    # The schema doesn't depend on the fields present
+    assert statsbombapi.arrow.table('events', []).schema == table.schema
+
+
+def test_matches_and_lineups_tables():
+    matches = statsbombapi.arrow.table('matches', data.MATCHES['v3']).to_pylist()
+    assert matches[1]['home_team_name'] == 'Warwick Wanderers'
+    assert matches[1]['match_date'] == datetime.date(655, 10, 15)
+    assert matches[0]['home_score'] is None
+
+    lineups = statsbombapi.arrow.table('lineups', data.LINEUPS['v2'])
+    assert lineups.num_rows == sum(len(team['lineup']) for team in data.LINEUPS['v2'])
+    assert lineups.column('team_name').to_pylist()[0] == data.LINEUPS['v2'][0]['team_name']
+
+
+def test_parquet_dataset(tmp_path):
+    with server.serve() as srv:
+        with pytest.warns(UserWarning):
+            loader = statsbombapi.loaders.OpenDataLoader(base_url=srv.url)
+        statsbombapi.parquet.ParquetWriter(tmp_path).write_season(loader, 4, 3)
+        client = statsbombapi.APIClient(loader=loader, decoder=statsbombapi.decoders.ArrowDecoder())
+        expected = client.events(4321)
+
+    # Only available matches have lineups and events
+    files = sorted(p.name for p in (tmp_path / 'events' / 'competition_id=4' / 'season_id=3').iterdir())
+    assert files == ['4321.parquet']
+
+    reader = statsbombapi.parquet.ParquetReader(tmp_path)
+    assert reader.competitions().num_rows == len(data.COMPETITIONS['v2'])
+    matches = reader.matches(competition_id=4, season_id=3)
+    assert sorted(matches.column('match_id').to_pylist()) == [1234, 4321]
+    assert set(matches.column('season_id').to_pylist()) == {3}
+
+    events = reader.events(competition_id=4, match_ids=[4321], columns=['match_id', 'type_name', 'location_x'])
+    assert events.column_names == ['match_id', 'type_name', 'location_x']
+    assert events.column('type_name').to_pylist() == expected.column('type_name').to_pylist()
+    assert reader.events(competition_id=5).num_rows == 0
+    assert reader.lineups(season_id=3).num_rows == sum(len(team['lineup']) for team in data.LINEUPS['v2'])
+
+
+def test_import_without_pyarrow():
+    # pyarrow is slow to import, so is only imported when decoding Arrow tables
+    code = 'import sys, statsbombapi; assert "pyarrow" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
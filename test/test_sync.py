@@ -0,0 +1,180 @@
+"""
+Test incremental syncing of (mocked) data into a local directory
+"""
+import copy
+import json
+
+import statsbombapi
+import statsbombapi.sync
+import data
+
+
+class _DictLoader:
+    def __init__(self):
+        self.competitions = [dict(data.COMPETITIONS['v2'][0], competition_id=4, season_id=3)]
+        self.matches = copy.deepcopy(data.MATCHES['v3'])
+        self.calls = []
+
+    def load_competitions(self):
+        self.calls.append('competitions')
+        return json.dumps(self.competitions).encode('utf8')
+
+    def load_matches(self, competition_id, season_id):
+        self.calls.append(('matches', competition_id, season_id))
+        return json.dumps(self.matches).encode('utf8')
+
+    def load_lineups(self, match_id):
+        self.calls.append(('lineups', match_id))
+        return json.dumps(data.LINEUPS['v2']).encode('utf8')
+
+    def load_events(self, match_id):
+        self.calls.append(('events', match_id))
+        if match_id != 4321:
+            raise statsbombapi.StatsbombAPIException(f'No events for {match_id}')
+        return json.dumps(data.EVENTS['v5']).encode('utf8')
+
+
+def test_sync(tmp_path):
+    loader = _DictLoader()
+
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync()
+    assert report.seasons_updated == [(4, 3)]
+    # Only available matches have lineups and events
+    assert report.matches_updated == [4321]
+    assert report.files_written == 4
+    assert loader.calls == ['competitions', ('matches', 4, 3), ('lineups', 4321), ('events', 4321)]
+
+    local = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    assert json.loads(local.load_events(4321)) == data.EVENTS['v5']
+
+    # Nothing has changed
+    loader.calls.clear()
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync()
+    assert (report.seasons_checked, report.seasons_updated) == (1, [])
+    assert loader.calls == ['competitions']
+
+    # The season has been updated, but not the match
+    loader.calls.clear()
+    loader.competitions[0]['match_updated'] = '2021-01-01T00:00:00.000000'
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync()
+    assert loader.calls == ['competitions', ('matches', 4, 3)]
+
+    # Both have been updated
+    loader.calls.clear()
+    loader.competitions[0]['match_updated'] = '2021-01-02T00:00:00.000000'
+    loader.matches[1]['last_updated'] = '2021-01-02T00:00:00.000'
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync()
+    assert report.matches_updated == [4321]
+    assert loader.calls == ['competitions', ('matches', 4, 3), ('lineups', 4321), ('events', 4321)]
+
+
+def test_sync_retries_errors(tmp_path):
+    loader = _DictLoader()
+    loader.matches[0]['match_status'] = 'available'
+
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync(seasons=[(4, 3)])
+    assert report.matches_updated == [4321]
+    assert list(report.errors) == [1234]
+    assert report.seasons_updated == []
+
+    # The failed match (and only the failed match) is retried
+    loader.calls.clear()
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync(seasons=[(4, 3)])
+    assert loader.calls == ['competitions', ('matches', 4, 3), ('lineups', 1234), ('events', 1234)]
+
+    loader.calls.clear()
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path).sync(seasons=[(1, 1)])
+    assert report.seasons_checked == 0
+    assert loader.calls == ['competitions']
+
+
+def test_sync_from_memory_mapped_files(tmp_path):
+    statsbombapi.sync.Mirror(_DictLoader(), tmp_path / 'source').run()
+    loader = statsbombapi.loaders.LocalLoader(tmp_path / 'source', 'json', mmap=True)
+    assert isinstance(loader.load_events(4321), memoryview)
+
+    report = statsbombapi.sync.Synchronizer(loader, tmp_path / 'synced').sync()
+    assert (report.matches_updated, report.errors) == ([4321], {})
+    report = statsbombapi.sync.Mirror(loader, tmp_path / 'mirrored').run()
+    assert (report.files_written, report.errors) == (3, {})
+
+    # Pack files are read as memoryviews too
+    statsbombapi.pack.write_pack(tmp_path / 'packed' / '4' / '3.sbpack', loader, 4, 3)
+    packed = statsbombapi.loaders.PackLoader(tmp_path / 'packed')
+    report = statsbombapi.sync.Mirror(packed, tmp_path / 'unpacked').run()
+    assert (report.files_written, report.errors) == (3, {})
+
+    for path in ('synced', 'mirrored', 'unpacked'):
+        local = statsbombapi.loaders.LocalLoader(tmp_path / path, 'json')
+        assert json.loads(local.load_events(4321)) == data.EVENTS['v5']
+
+
+def test_mirror_resumes(tmp_path):
+    loader = _DictLoader()
+    loader.matches[0]['match_status'] = 'available'
+
+    # Events for match 1234 fail, as if the mirror crashed part of the way through
+    report = statsbombapi.sync.Mirror(loader, tmp_path, max_workers=2).run()
+    assert report.files_written == 4
+    assert list(report.errors) == ['events/1234']
+
+    loader.calls.clear()
+    loader.load_events = lambda match_id: json.dumps(data.EVENTS['v5']).encode('utf8')
+    report = statsbombapi.sync.Mirror(loader, tmp_path, max_workers=2).run()
+    assert (report.files_written, report.files_skipped, report.errors) == (2, 3, {})
+    assert loader.calls == ['competitions', ('matches', 4, 3)]
+
+    local = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    for match_id in (1234, 4321):
+        assert json.loads(local.load_events(match_id)) == data.EVENTS['v5']
+        assert json.loads(local.load_lineups(match_id)) == data.LINEUPS['v2']
+
+
+def test_mirror_updates(tmp_path):
+    loader = _DictLoader()
+    statsbombapi.sync.Mirror(loader, tmp_path).run()
+
+    # The season's matches are mirrored again, but only updated matches are refetched
+    loader.calls.clear()
+    loader.matches[0].update(match_status='available', home_score=3)
+    loader.matches[1].update(home_score=4, last_updated='2020-03-01T09:00:00.000')
+    report = statsbombapi.sync.Mirror(loader, tmp_path).run()
+    assert (report.files_written, report.files_skipped) == (4, 0)
+    assert list(report.errors) == ['events/1234']
+    assert sorted(map(str, loader.calls)) == sorted(map(str, [
+        'competitions', ('matches', 4, 3),
+        ('lineups', 1234), ('events', 1234), ('lineups', 4321), ('events', 4321),
+    ]))
+
+    local = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    assert [m['home_score'] for m in json.loads(local.load_matches(4, 3))] == [3, 4]
+
+
+def test_mirror_integrity(tmp_path):
+    loader = _DictLoader()
+    statsbombapi.sync.Mirror(loader, tmp_path).run()
+
+    # A corrupted file is fetched again
+    (tmp_path / 'lineups' / '4321.json').write_bytes(b'[{"team_id": 9')
+    report = statsbombapi.sync.Mirror(loader, tmp_path).run()
+    assert (report.files_written, report.files_skipped) == (2, 1)
+
+    # Invalid responses are not written
+    loader.load_lineups = lambda match_id: b'[{"team_id": 9'
+    (tmp_path / 'lineups' / '4321.json').unlink()
+    report = statsbombapi.sync.Mirror(loader, tmp_path).run()
+    assert list(report.errors) == ['lineups/4321']
+    assert not (tmp_path / 'lineups' / '4321.json').exists()
+
+
+def test_mirror_compression(tmp_path):
+    loader = _DictLoader()
+    statsbombapi.sync.Mirror(loader, tmp_path, compression='gzip').run()
+    assert (tmp_path / 'events' / '4321.json.gz').exists()
+
+    local = statsbombapi.loaders.LocalLoader(tmp_path, 'json')
+    assert json.loads(local.load_events(4321)) == data.EVENTS['v5']
+
+    loader.calls.clear()
+    report = statsbombapi.sync.Mirror(loader, tmp_path, compression='gzip', verify_hash=True).run()
+    assert (report.files_written, report.files_skipped) == (1, 2)